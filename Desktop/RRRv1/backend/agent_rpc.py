@@ -0,0 +1,274 @@
+"""
+Agent RPC bridge for multi-worker dashboard deployments
+
+The trading agent process serves its data provider over a Unix socket
+(AgentRPCServer); each uvicorn worker talks to it through AgentRPCClient
+instead of holding the agent in-process. Frames are length-prefixed
+msgpack: requests are [method, args], replies are [ok, result_or_error].
+"""
+
+import asyncio
+import inspect
+import logging
+import numbers
+import os
+from decimal import Decimal
+from typing import Any, Optional, Tuple
+
+import msgspec
+import orjson
+
+from auth import get_api_key_manager
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+AGENT_RPC_SOCKET = os.getenv("AGENT_RPC_SOCKET", "/tmp/rrrv1_agent.sock")
+
+# Provider methods reachable over RPC
+EXPOSED_METHODS = frozenset({
+    "get_portfolio_status",
+    "get_positions",
+    "get_strategies_performance",
+    "get_metrics",
+    "get_funding_data",
+    "get_recent_trades",
+    "get_recent_trades_json",
+    "trigger_emergency_stop",
+    "close_position",
+    "reduce_position",
+    "generate_api_key",
+    "revoke_api_key",
+})
+
+_HEADER_SIZE = 4  # big-endian payload length
+
+
+def enc_hook(obj: Any) -> Any:
+    """
+    Encode values msgspec/orjson have no native support for.
+
+    Used by the RPC and WebSocket msgspec encoders and as orjson's default
+    for REST responses, so provider output encodes (or fails) the same way
+    in-process and over RPC. Numeric scalars from other libraries (e.g.
+    numpy) and Decimals become numbers. Anything else is an error rather
+    than a silent string, so unexpected provider types show up immediately.
+    """
+    if isinstance(obj, numbers.Integral):
+        return int(obj)
+    if isinstance(obj, (numbers.Real, Decimal)):
+        return float(obj)
+    raise TypeError(f"Cannot encode {type(obj).__name__}")
+
+
+# datetimes and Enums are encoded natively (ISO string / value);
+# Decimals go out as numbers, like the float fields around them
+_encoder = msgspec.msgpack.Encoder(enc_hook=enc_hook, decimal_format="number")
+_decoder = msgspec.msgpack.Decoder()
+
+
+async def _read_frame(reader: asyncio.StreamReader) -> Any:
+    """Read and decode one length-prefixed frame."""
+    header = await reader.readexactly(_HEADER_SIZE)
+    payload = await reader.readexactly(int.from_bytes(header, "big"))
+    return _decoder.decode(payload)
+
+
+def _write_frame(writer: asyncio.StreamWriter, message: Any) -> None:
+    """Encode and buffer one length-prefixed frame."""
+    payload = _encoder.encode(message)
+    writer.write(len(payload).to_bytes(_HEADER_SIZE, "big") + payload)
+
+
+class AgentRPCServer:
+    """
+    Serve a data provider's methods over a Unix socket.
+    Runs on the trading agent's event loop.
+    """
+
+    def __init__(self, provider, socket_path: str = AGENT_RPC_SOCKET):
+        """
+        Initialize RPC server.
+
+        Args:
+            provider: AgentDataProvider instance to expose
+            socket_path: Unix socket path to listen on
+        """
+        self.provider = provider
+        self.socket_path = socket_path
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        """Start listening on the Unix socket"""
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+        self._server = await asyncio.start_unix_server(self._handle_client, path=self.socket_path)
+        os.chmod(self.socket_path, 0o600)
+        logger.info(f"Agent RPC server listening on {self.socket_path}")
+
+    async def stop(self) -> None:
+        """Stop the server and remove the socket"""
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        logger.info("Agent RPC server stopped")
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answer requests from one worker connection until it closes"""
+        try:
+            while True:
+                try:
+                    method, args = await _read_frame(reader)
+                except asyncio.IncompleteReadError:
+                    break
+
+                reply = await self._dispatch(method, args)
+                try:
+                    _write_frame(writer, reply)
+                except (TypeError, msgspec.EncodeError) as e:
+                    # Report it like the in-process path would, keeping the connection
+                    logger.error(f"Agent RPC call {method} returned an unencodable result: {e}")
+                    _write_frame(writer, (False, f"Cannot encode result: {e}"))
+                await writer.drain()
+        except Exception as e:
+            logger.error(f"Agent RPC connection error: {e}")
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method: str, args: list) -> Tuple[bool, Any]:
+        """Run one provider call and build the reply"""
+        if method not in EXPOSED_METHODS:
+            return False, f"Method not exposed: {method}"
+
+        # Methods the server implements on top of the provider take precedence
+        target = self if hasattr(AgentRPCServer, method) else self.provider
+        try:
+            # Sync methods run in a worker thread so dashboard reads don't
+            # block the trading loop (as provider_call does in-process)
+            fn = getattr(target, method)
+            if inspect.iscoroutinefunction(fn):
+                result = await fn(*args)
+            else:
+                result = await asyncio.to_thread(fn, *args)
+            return True, result
+        except Exception as e:
+            logger.error(f"Agent RPC call {method} failed: {e}")
+            return False, str(e)
+
+    def get_recent_trades_json(self, limit: int = 50) -> bytes:
+        """
+        Recent trades serialized to JSON in the agent process.
+
+        Workers pass the bytes straight through, so trade history is not
+        decoded from msgpack and re-encoded on every request.
+        """
+        trades = self.provider.get_recent_trades(limit)
+        return orjson.dumps(trades, default=enc_hook, option=orjson.OPT_NON_STR_KEYS)
+
+    def generate_api_key(self, name: str) -> str:
+        """Create an API key in the agent process, which owns the key file."""
+        return get_api_key_manager().generate_key(name)
+
+    def revoke_api_key(self, name: str) -> bool:
+        """Revoke API keys by name in the agent process, which owns the key file."""
+        return get_api_key_manager().revoke_key_by_name(name)
+
+
+class AgentRPCClient:
+    """
+    Data provider stand-in for API workers.
+    Mirrors the AgentDataProvider methods, but every call is a coroutine
+    answered by the agent process over the Unix socket.
+    """
+
+    def __init__(self, socket_path: str = AGENT_RPC_SOCKET):
+        """
+        Initialize RPC client.
+
+        Args:
+            socket_path: Unix socket path of the agent's RPC server
+        """
+        self.socket_path = socket_path
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock = asyncio.Lock()
+
+    async def close(self) -> None:
+        """Close the connection to the agent"""
+        if self._writer:
+            self._writer.close()
+            self._reader = self._writer = None
+
+    async def call(self, method: str, *args) -> Any:
+        """
+        Call a provider method in the agent process.
+
+        Args:
+            method: Provider method name
+            *args: Positional arguments for the method
+
+        Returns:
+            The method's result
+
+        Raises:
+            RuntimeError: If the agent reports an error
+        """
+        async with self._lock:
+            try:
+                if self._writer is None:
+                    self._reader, self._writer = await asyncio.open_unix_connection(self.socket_path)
+
+                _write_frame(self._writer, (method, args))
+                await self._writer.drain()
+                ok, result = await _read_frame(self._reader)
+            except BaseException:
+                # Drop the connection so the next call reconnects. This
+                # includes cancellation: a reply left unread on the socket
+                # would otherwise be taken as the answer to the next call.
+                await self.close()
+                raise
+
+        if not ok:
+            raise RuntimeError(f"Agent RPC call {method} failed: {result}")
+        return result
+
+    async def get_portfolio_status(self) -> dict:
+        return await self.call("get_portfolio_status")
+
+    async def get_positions(self) -> list:
+        return await self.call("get_positions")
+
+    async def get_strategies_performance(self) -> list:
+        return await self.call("get_strategies_performance")
+
+    async def get_metrics(self) -> dict:
+        return await self.call("get_metrics")
+
+    async def get_funding_data(self) -> dict:
+        return await self.call("get_funding_data")
+
+    async def get_recent_trades(self, limit: int = 50) -> list:
+        return await self.call("get_recent_trades", limit)
+
+    async def get_recent_trades_json(self, limit: int = 50) -> bytes:
+        return await self.call("get_recent_trades_json", limit)
+
+    async def generate_api_key(self, name: str) -> str:
+        return await self.call("generate_api_key", name)
+
+    async def revoke_api_key(self, name: str) -> bool:
+        return await self.call("revoke_api_key", name)
+
+    async def trigger_emergency_stop(self) -> bool:
+        return await self.call("trigger_emergency_stop")
+
+    async def close_position(self, asset: str) -> bool:
+        return await self.call("close_position", asset)
+
+    async def reduce_position(self, asset: str, reduction_pct: float) -> bool:
+        return await self.call("reduce_position", asset, reduction_pct)
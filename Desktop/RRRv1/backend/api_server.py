@@ -5,16 +5,24 @@ Includes API key authentication and rate limiting (Phase 2)
 """
 
 import asyncio
+import inspect
 import logging
-from typing import List, Set, Optional
+import time
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from datetime import datetime
-import json
+import gzip
+import hashlib
 import os
+import sys
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Depends, Header
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Depends, Header, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response, ORJSONResponse as _ORJSONResponse
+from brotli_asgi import BrotliMiddleware
+import msgspec
+import orjson
 import uvicorn
 
 from models import (
@@ -22,6 +30,7 @@ from models import (
     FundingData, TradeRecord, DashboardData, WebSocketUpdate, StrategySignal
 )
 from agent_integration import AgentDataProvider
+from agent_rpc import AgentRPCClient, AgentRPCServer, AGENT_RPC_SOCKET, enc_hook
 from database import TradingDatabase
 from auth import (
     get_api_key_manager, get_rate_limiter, initialize_default_key,
@@ -35,11 +44,35 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
+class ORJSONResponse(_ORJSONResponse):
+    """
+    FastAPI's orjson response, also accepting non-str dict keys and
+    encoding other values with enc_hook, as the RPC path does.
+    """
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, default=enc_hook, option=orjson.OPT_NON_STR_KEYS)
+
+
+class BroadcastUpdate(msgspec.Struct):
+    """Event pushed to all WebSocket clients"""
+    event_type: str
+    data: Any
+    timestamp: str
+
+
+# Same value handling as the agent RPC encoder, so events carry numbers
+# for numpy scalars and Decimals whichever process produced them
+_update_encoder = msgspec.json.Encoder(enc_hook=enc_hook, decimal_format="number")
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="RRRv1 Trading Dashboard API",
     description="Real-time monitoring and control for RRRv1 autonomous trading system",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware - restrict to localhost for single-user setup
@@ -52,18 +85,43 @@ app.add_middleware(
     allow_headers=["Content-Type", "X-API-Key"],
 )
 
+# Compress larger JSON responses. Added after CORS so it wraps it and
+# compresses last; clients without br support get gzip.
+app.add_middleware(BrotliMiddleware, quality=4, minimum_size=1024, gzip_fallback=True)
+
 # Global state
-data_provider: AgentDataProvider = None
+data_provider = None  # AgentDataProvider in-process, AgentRPCClient in API workers
 database: TradingDatabase = None
 api_key_manager: Optional[APIKeyManager] = None
 rate_limiter: Optional[RateLimiter] = None
-active_websockets: Set[WebSocket] = set()
+active_websockets: Dict[WebSocket, asyncio.Queue] = {}  # client -> pending outbound frames
 update_interval = 5  # seconds
+API_WORKERS = int(os.getenv("API_WORKERS", "1"))  # >1 requires the agent to run initialize_agent_side, which owns the API key file
+WS_SEND_QUEUE_SIZE = 64  # frames buffered per client before the oldest is dropped
+
+# UTC ISO timestamp refreshed once per second by _tick_clock, for event payloads
+current_timestamp = datetime.utcnow().isoformat()
+
+# Short-lived cache of serialized read responses: key -> (monotonic time, JSON bytes)
+RESPONSE_CACHE_TTL = 1.0  # seconds
+_response_cache: Dict[str, Tuple[float, bytes]] = {}
+_response_cache_locks: Dict[str, asyncio.Lock] = {}
 
 # ============================================================================
 # Authentication & Rate Limiting
 # ============================================================================
 
+@lru_cache(maxsize=2048)
+def _bucket_key(api_key: str) -> bytes:
+    """
+    Rate limiter bucket key for an API key.
+
+    An 8-byte SHA-256 prefix, computed once per key, so limiter buckets are
+    keyed by short digests rather than by the raw key strings.
+    """
+    return hashlib.sha256(api_key.encode()).digest()[:8]
+
+
 async def verify_api_key(x_api_key: str = Header(None)) -> str:
     """
     Dependency to verify API key on protected endpoints.
@@ -94,18 +152,37 @@ async def verify_api_key(x_api_key: str = Header(None)) -> str:
     return x_api_key
 
 
-async def check_rate_limit(api_key: str = Depends(verify_api_key), endpoint: str = None):
+async def auth_and_limit(x_api_key: str = Header(None)) -> str:
     """
-    Dependency to check rate limits for an API key.
+    Dependency to verify the API key and enforce rate limits in one step.
+
+    Protected endpoints resolve this single dependency instead of chaining
+    a rate-limit dependency onto verify_api_key.
 
     Args:
-        api_key: Verified API key
-        endpoint: Endpoint being accessed
+        x_api_key: API key from X-API-Key header
+
+    Returns:
+        The verified API key
 
     Raises:
-        HTTPException: If rate limit exceeded
+        HTTPException: If key is missing or invalid, or rate limit exceeded
     """
-    is_allowed, remaining, reset_time = rate_limiter.is_allowed(api_key, endpoint)
+    if not x_api_key:
+        logger.warning("Request attempted without API key")
+        raise HTTPException(
+            status_code=401,
+            detail="Missing API key. Use X-API-Key header."
+        )
+
+    if not api_key_manager.verify_key(x_api_key):
+        logger.warning(f"Invalid API key attempted")
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid or disabled API key"
+        )
+
+    is_allowed, remaining, reset_time = rate_limiter.is_allowed(_bucket_key(x_api_key))
 
     if not is_allowed:
         logger.warning(f"Rate limit exceeded for API key")
@@ -115,7 +192,65 @@ async def check_rate_limit(api_key: str = Depends(verify_api_key), endpoint: str
             headers={"Retry-After": str(int((reset_time - datetime.utcnow()).total_seconds()))}
         )
 
-    return api_key
+    return x_api_key
+
+# ============================================================================
+# Response Caching
+# ============================================================================
+
+async def cached_json_response(key: str, build: Callable[[], Awaitable]) -> Response:
+    """
+    Serve a JSON payload from the short-lived response cache.
+
+    Concurrent misses for the same key are collapsed so the payload is built
+    and serialized once per RESPONSE_CACHE_TTL window.
+
+    Args:
+        key: Cache key for the payload
+        build: Coroutine function returning the data to serialize on a cache miss
+
+    Returns:
+        Response carrying the cached JSON bytes
+    """
+    entry = _response_cache.get(key)
+    if entry and time.monotonic() - entry[0] < RESPONSE_CACHE_TTL:
+        return Response(entry[1], media_type="application/json")
+
+    lock = _response_cache_locks.get(key)
+    if lock is None:
+        lock = _response_cache_locks[key] = asyncio.Lock()
+
+    async with lock:
+        # Another request may have refreshed the entry while we waited
+        entry = _response_cache.get(key)
+        if not entry or time.monotonic() - entry[0] >= RESPONSE_CACHE_TTL:
+            payload = orjson.dumps(await build(), default=enc_hook, option=orjson.OPT_NON_STR_KEYS)
+            # Age counts from when the data was ready, not when the build started
+            entry = (time.monotonic(), payload)
+            _response_cache[key] = entry
+
+    return Response(entry[1], media_type="application/json")
+
+
+async def provider_call(method: str, *args) -> Any:
+    """
+    Call a data provider method without blocking the event loop.
+
+    Sync AgentDataProvider methods run in a worker thread; coroutine methods
+    (AgentRPCClient, async control actions) are awaited directly.
+
+    Args:
+        method: Provider method name
+        *args: Positional arguments for the method
+
+    Returns:
+        The method's result
+    """
+    fn = getattr(data_provider, method)
+    if inspect.iscoroutinefunction(fn):
+        return await fn(*args)
+    return await asyncio.to_thread(fn, *args)
+
 
 # ============================================================================
 # Initialization
@@ -140,17 +275,80 @@ def initialize_dashboard(agent, metrics_calc=None):
     # Create default key if none exist
     initialize_default_key()
 
+    check_provider_schema()
+
     logger.info("Dashboard initialized with trading agent and authentication")
 
 
+async def initialize_agent_side(agent, metrics_calc=None,
+                                socket_path: str = AGENT_RPC_SOCKET) -> AgentRPCServer:
+    """
+    Serve the trading agent's data to out-of-process API workers.
+
+    Call from the agent's event loop, then run this module with
+    API_WORKERS > 1; each worker connects through AgentRPCClient.
+
+    The agent process owns the API key file: the default key is created
+    here, and key changes from workers are made here over RPC. Workers
+    load the file read-only and reload it when it changes.
+
+    Args:
+        agent: TradingAgent instance
+        metrics_calc: Optional MetricsCalculator instance
+        socket_path: Unix socket path for the RPC server
+
+    Returns:
+        The started AgentRPCServer
+    """
+    initialize_default_key()
+
+    server = AgentRPCServer(AgentDataProvider(agent, metrics_calc), socket_path)
+    await server.start()
+    return server
+
+
+def check_provider_schema() -> bool:
+    """
+    Validate one round of provider output against the API models.
+
+    Read endpoints return provider dicts without pydantic validation, so
+    schema drift between the agent and models.py is caught here once at
+    startup instead of on every request.
+
+    Returns:
+        True if all provider data matches the models, False otherwise
+    """
+    try:
+        checks = (
+            (PortfolioData, [data_provider.get_portfolio_status()]),
+            (PositionData, data_provider.get_positions()),
+            (StrategyPerformance, data_provider.get_strategies_performance()),
+            (MetricsData, [data_provider.get_metrics()]),
+            (FundingData, [data_provider.get_funding_data()]),
+            (TradeRecord, data_provider.get_recent_trades(10))
+        )
+    except Exception as e:
+        logger.error(f"Failed to read provider data for schema check: {e}")
+        return False
+
+    schema_ok = True
+    for model, records in checks:
+        for record in records:
+            try:
+                model(**record)
+            except Exception as e:
+                logger.warning(f"Provider data does not match {model.__name__}: {e}")
+                schema_ok = False
+                break
+
+    return schema_ok
+
+
 # ============================================================================
 # REST API Endpoints
 # ============================================================================
 
-@app.get("/", response_class=HTMLResponse)
-async def root():
-    """Serve dashboard info"""
-    return """
+_ROOT_HTML = b"""
     <html>
         <head>
             <title>RRRv1 Trading Dashboard API</title>
@@ -181,82 +379,123 @@ async def root():
         </body>
     </html>
     """
+_ROOT_GZ = gzip.compress(_ROOT_HTML, compresslevel=9)
+_ROOT_HEADERS = {"Cache-Control": "public, max-age=3600", "Vary": "Accept-Encoding"}
+
 
+@app.get("/", response_class=HTMLResponse)
+async def root(request: Request):
+    """Serve dashboard info (pre-rendered and pre-compressed at import)"""
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        return Response(
+            _ROOT_GZ,
+            media_type="text/html; charset=utf-8",
+            headers={**_ROOT_HEADERS, "Content-Encoding": "gzip"}
+        )
+
+    return Response(_ROOT_HTML, media_type="text/html; charset=utf-8", headers=_ROOT_HEADERS)
 
-@app.get("/api/portfolio", response_model=PortfolioData)
-async def get_portfolio(api_key: str = Depends(check_rate_limit)):
+
+@app.get("/api/portfolio")
+async def get_portfolio(api_key: str = Depends(auth_and_limit)):
     """Get portfolio status (requires API key)"""
     if not data_provider:
         raise HTTPException(status_code=503, detail="Dashboard not initialized")
 
-    return PortfolioData(**data_provider.get_portfolio_status())
+    return await cached_json_response(
+        "portfolio", lambda: provider_call("get_portfolio_status")
+    )
 
 
-@app.get("/api/positions", response_model=List[PositionData])
-async def get_positions(api_key: str = Depends(check_rate_limit)):
+@app.get("/api/positions")
+async def get_positions(api_key: str = Depends(auth_and_limit)):
     """Get active positions (requires API key)"""
     if not data_provider:
         raise HTTPException(status_code=503, detail="Dashboard not initialized")
 
-    positions = data_provider.get_positions()
-    return [PositionData(**pos) for pos in positions]
+    return await provider_call("get_positions")
 
 
-@app.get("/api/strategies", response_model=List[StrategyPerformance])
-async def get_strategies(api_key: str = Depends(check_rate_limit)):
+@app.get("/api/strategies")
+async def get_strategies(api_key: str = Depends(auth_and_limit)):
     """Get strategy performance (requires API key)"""
     if not data_provider:
         raise HTTPException(status_code=503, detail="Dashboard not initialized")
 
-    strategies = data_provider.get_strategies_performance()
-    return [StrategyPerformance(**strat) for strat in strategies]
+    return await provider_call("get_strategies_performance")
 
 
-@app.get("/api/metrics", response_model=MetricsData)
-async def get_metrics(api_key: str = Depends(check_rate_limit)):
+@app.get("/api/metrics")
+async def get_metrics(api_key: str = Depends(auth_and_limit)):
     """Get trading metrics (requires API key)"""
     if not data_provider:
         raise HTTPException(status_code=503, detail="Dashboard not initialized")
 
-    return MetricsData(**data_provider.get_metrics())
+    return await cached_json_response(
+        "metrics", lambda: provider_call("get_metrics")
+    )
 
 
-@app.get("/api/funding", response_model=FundingData)
-async def get_funding(api_key: str = Depends(check_rate_limit)):
+@app.get("/api/funding")
+async def get_funding(api_key: str = Depends(auth_and_limit)):
     """Get funding arbitrage statistics (requires API key)"""
     if not data_provider:
         raise HTTPException(status_code=503, detail="Dashboard not initialized")
 
-    funding_data = data_provider.get_funding_data()
-    return FundingData(**funding_data)
+    return await provider_call("get_funding_data")
 
 
-@app.get("/api/trades", response_model=List[TradeRecord])
-async def get_trades(api_key: str = Depends(check_rate_limit), limit: int = 50):
+@app.get("/api/trades")
+async def get_trades(api_key: str = Depends(auth_and_limit), limit: int = 50):
     """Get trade history (requires API key)"""
     if not data_provider:
         raise HTTPException(status_code=503, detail="Dashboard not initialized")
 
-    trades = data_provider.get_recent_trades(limit)
-    return [TradeRecord(**trade) for trade in trades]
+    # API workers get the trades pre-serialized by the agent process
+    if isinstance(data_provider, AgentRPCClient):
+        payload = await data_provider.get_recent_trades_json(limit)
+    else:
+        trades = await provider_call("get_recent_trades", limit)
+        payload = orjson.dumps(trades, default=enc_hook, option=orjson.OPT_NON_STR_KEYS)
+
+    return Response(payload, media_type="application/json")
 
 
-@app.get("/api/dashboard", response_model=DashboardData)
-async def get_full_dashboard(api_key: str = Depends(check_rate_limit)):
+@app.get("/api/dashboard")
+async def get_full_dashboard(api_key: str = Depends(auth_and_limit)):
     """Get complete dashboard state (requires API key)"""
     if not data_provider:
         raise HTTPException(status_code=503, detail="Dashboard not initialized")
 
-    return DashboardData(
-        portfolio=PortfolioData(**data_provider.get_portfolio_status()),
-        positions=[PositionData(**pos) for pos in data_provider.get_positions()],
-        strategies=[StrategyPerformance(**strat) for strat in data_provider.get_strategies_performance()],
-        metrics=MetricsData(**data_provider.get_metrics()),
-        funding=FundingData(**data_provider.get_funding_data()),
-        recent_signals=[],  # Would populate from agent
-        recent_trades=[TradeRecord(**trade) for trade in data_provider.get_recent_trades(10)]
+    return await cached_json_response("dashboard", _build_dashboard)
+
+
+async def _build_dashboard() -> dict:
+    """
+    Collect the complete dashboard state from the data provider.
+
+    The provider calls run concurrently so a slow (e.g. database-backed)
+    call neither serializes the others nor blocks the event loop.
+    """
+    portfolio, positions, strategies, metrics, funding, trades = await asyncio.gather(
+        provider_call("get_portfolio_status"),
+        provider_call("get_positions"),
+        provider_call("get_strategies_performance"),
+        provider_call("get_metrics"),
+        provider_call("get_funding_data"),
+        provider_call("get_recent_trades", 10)
     )
 
+    return {
+        'portfolio': portfolio,
+        'positions': positions,
+        'strategies': strategies,
+        'metrics': metrics,
+        'funding': funding,
+        'recent_signals': [],  # Would populate from agent
+        'recent_trades': trades
+    }
+
 
 # ============================================================================
 # API Key Management Endpoints
@@ -268,7 +507,7 @@ async def get_auth_status(api_key: str = Depends(verify_api_key)):
     if not api_key_manager:
         raise HTTPException(status_code=503, detail="Authentication not initialized")
 
-    usage = rate_limiter.get_usage(api_key) if rate_limiter else {}
+    usage = rate_limiter.get_usage(_bucket_key(api_key)) if rate_limiter else {}
     return {
         "authenticated": True,
         "key_valid": True,
@@ -295,7 +534,11 @@ async def create_api_key(api_key: str = Depends(verify_api_key), name: str = "ne
     if not api_key_manager:
         raise HTTPException(status_code=503, detail="Authentication not initialized")
 
-    new_key = api_key_manager.generate_key(name)
+    if isinstance(data_provider, AgentRPCClient):
+        new_key = await data_provider.generate_api_key(name)
+        api_key_manager.reload()
+    else:
+        new_key = api_key_manager.generate_key(name)
     logger.warning(f"New API key generated: {name}")
 
     return {
@@ -313,11 +556,13 @@ async def revoke_api_key(key_name: str, api_key: str = Depends(verify_api_key)):
     if not api_key_manager:
         raise HTTPException(status_code=503, detail="Authentication not initialized")
 
-    # Find key by name and revoke
-    keys = api_key_manager.list_keys()
-    matching_keys = [k for k in keys if k.get("name") == key_name]
+    if isinstance(data_provider, AgentRPCClient):
+        revoked = await data_provider.revoke_api_key(key_name)
+        api_key_manager.reload()
+    else:
+        revoked = api_key_manager.revoke_key_by_name(key_name)
 
-    if not matching_keys:
+    if not revoked:
         raise HTTPException(status_code=404, detail=f"Key '{key_name}' not found")
 
     logger.warning(f"API key revoked: {key_name}")
@@ -334,10 +579,10 @@ async def get_usage(api_key: str = Depends(verify_api_key)):
     if not rate_limiter:
         raise HTTPException(status_code=503, detail="Rate limiter not initialized")
 
-    usage = rate_limiter.get_usage(api_key)
+    usage = rate_limiter.get_usage(_bucket_key(api_key))
     return {
         "current_usage": usage,
-        "time_checked": datetime.utcnow().isoformat()
+        "time_checked": current_timestamp
     }
 
 
@@ -346,49 +591,49 @@ async def get_usage(api_key: str = Depends(verify_api_key)):
 # ============================================================================
 
 @app.post("/api/emergency-stop")
-async def emergency_stop(api_key: str = Depends(check_rate_limit)):
+async def emergency_stop(api_key: str = Depends(auth_and_limit)):
     """Trigger emergency stop (requires API key)"""
     if not data_provider:
         raise HTTPException(status_code=503, detail="Dashboard not initialized")
 
     logger.warning("Emergency stop triggered via API")
-    success = data_provider.trigger_emergency_stop()
+    success = await provider_call("trigger_emergency_stop")
 
     if success:
         # Broadcast to WebSockets
-        await broadcast_update({
-            'event_type': 'emergency_stop',
-            'data': {'message': 'Emergency stop triggered'},
-            'timestamp': datetime.now().isoformat()
-        })
+        await broadcast_update(BroadcastUpdate(
+            event_type='emergency_stop',
+            data={'message': 'Emergency stop triggered'},
+            timestamp=current_timestamp
+        ))
         return {'status': 'success', 'message': 'Emergency stop triggered'}
     else:
         raise HTTPException(status_code=500, detail="Failed to trigger emergency stop")
 
 
 @app.post("/api/close-position/{asset}")
-async def close_position(asset: str, api_key: str = Depends(check_rate_limit)):
+async def close_position(asset: str, api_key: str = Depends(auth_and_limit)):
     """Close a specific position (requires API key)"""
     if not data_provider:
         raise HTTPException(status_code=503, detail="Dashboard not initialized")
 
     logger.info(f"Close position request for {asset}")
-    success = await data_provider.close_position(asset)
+    success = await provider_call("close_position", asset)
 
     if success:
         # Broadcast to WebSockets
-        await broadcast_update({
-            'event_type': 'position_closed',
-            'data': {'asset': asset},
-            'timestamp': datetime.now().isoformat()
-        })
+        await broadcast_update(BroadcastUpdate(
+            event_type='position_closed',
+            data={'asset': asset},
+            timestamp=current_timestamp
+        ))
         return {'status': 'success', 'message': f'Position {asset} closed'}
     else:
         raise HTTPException(status_code=500, detail=f"Failed to close position {asset}")
 
 
 @app.post("/api/reduce-position/{asset}")
-async def reduce_position(asset: str, api_key: str = Depends(check_rate_limit), reduction_pct: float = 0.5):
+async def reduce_position(asset: str, api_key: str = Depends(auth_and_limit), reduction_pct: float = 0.5):
     """Reduce a position by percentage (requires API key)"""
     if not data_provider:
         raise HTTPException(status_code=503, detail="Dashboard not initialized")
@@ -397,15 +642,15 @@ async def reduce_position(asset: str, api_key: str = Depends(check_rate_limit),
         raise HTTPException(status_code=400, detail="reduction_pct must be between 0 and 1")
 
     logger.info(f"Reduce position request for {asset} by {reduction_pct:.0%}")
-    success = await data_provider.reduce_position(asset, reduction_pct)
+    success = await provider_call("reduce_position", asset, reduction_pct)
 
     if success:
         # Broadcast to WebSockets
-        await broadcast_update({
-            'event_type': 'position_reduced',
-            'data': {'asset': asset, 'reduction_pct': reduction_pct},
-            'timestamp': datetime.now().isoformat()
-        })
+        await broadcast_update(BroadcastUpdate(
+            event_type='position_reduced',
+            data={'asset': asset, 'reduction_pct': reduction_pct},
+            timestamp=current_timestamp
+        ))
         return {'status': 'success', 'message': f'Position {asset} reduced by {reduction_pct:.0%}'}
     else:
         raise HTTPException(status_code=500, detail=f"Failed to reduce position {asset}")
@@ -415,14 +660,21 @@ async def reduce_position(asset: str, api_key: str = Depends(check_rate_limit),
 # WebSocket Endpoint
 # ============================================================================
 
+_PING_PREFIX = b'{"type":"ping"'
+_PONG = b'{"type":"pong"}'
+
+
 @app.websocket("/ws/live")
 async def websocket_endpoint(websocket: WebSocket, api_key: Optional[str] = None):
     """
     WebSocket endpoint for real-time updates.
     Requires API key via query parameter: ws://host/ws/live?api_key=YOUR_KEY
 
+    Updates are sent as binary frames carrying UTF-8 JSON; browser clients
+    should set ws.binaryType = 'arraybuffer' and decode with TextDecoder.
+
     Clients receive updates on:
-    - Position price changes
+    - Position snapshots (all open positions in one 'positions_snapshot' frame)
     - Liquidation distance changes
     - New signals
     - Trade executions
@@ -444,60 +696,103 @@ async def websocket_endpoint(websocket: WebSocket, api_key: Optional[str] = None
         return
 
     # Check rate limit
-    is_allowed, _, reset_time = rate_limiter.is_allowed(api_key, "/ws/live") if rate_limiter else (True, 0, None)
+    is_allowed, _, reset_time = rate_limiter.is_allowed(_bucket_key(api_key), "/ws/live") if rate_limiter else (True, 0, None)
     if not is_allowed:
         await websocket.close(code=4029, reason=f"Rate limit exceeded. Resets at {reset_time.isoformat()}")
         logger.warning("WebSocket connection rejected: rate limit exceeded")
         return
 
     await websocket.accept()
-    active_websockets.add(websocket)
+    queue: asyncio.Queue = asyncio.Queue(maxsize=WS_SEND_QUEUE_SIZE)
+    active_websockets[websocket] = queue
+    writer = asyncio.create_task(_websocket_writer(websocket, queue))
 
     logger.info(f"WebSocket client connected with valid API key. Total clients: {len(active_websockets)}")
 
     try:
         while True:
             # Receive any client messages (heartbeat/commands)
-            data = await asyncio.wait_for(websocket.receive_text(), timeout=30)
-            message = json.loads(data)
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(frame.get("code", 1000))
+
+            # Binary frames are preferred; text frames are still accepted
+            data = frame.get("bytes") or (frame.get("text") or "").encode()
+
+            # Heartbeats are answered without parsing the frame
+            if data.startswith(_PING_PREFIX):
+                _enqueue_frame(queue, _PONG)
+                continue
+
+            message = orjson.loads(data)
 
             if message.get('type') == 'ping':
-                await websocket.send_json({'type': 'pong'})
+                _enqueue_frame(queue, _PONG)
 
-    except asyncio.TimeoutError:
-        # Timeout is normal for long-polling
-        pass
     except WebSocketDisconnect:
         logger.info("WebSocket client disconnected")
     except Exception as e:
         logger.error(f"WebSocket error: {e}")
     finally:
-        active_websockets.discard(websocket)
+        writer.cancel()
+        active_websockets.pop(websocket, None)
         logger.info(f"WebSocket client removed. Total clients: {len(active_websockets)}")
 
 
-async def broadcast_update(update: dict):
+def _enqueue_frame(queue: asyncio.Queue, payload: bytes) -> None:
+    """
+    Queue a frame for one client, dropping its oldest pending frame when full.
+
+    Args:
+        queue: The client's send queue
+        payload: Encoded frame to send
+    """
+    try:
+        queue.put_nowait(payload)
+    except asyncio.QueueFull:
+        queue.get_nowait()
+        queue.put_nowait(payload)
+
+
+async def _websocket_writer(websocket: WebSocket, queue: asyncio.Queue):
+    """
+    Drain a client's send queue onto its socket.
+
+    Runs as one task per connection so a slow client only backs up its own
+    queue instead of stalling broadcasts to everyone else.
+
+    Args:
+        websocket: Client connection
+        queue: The client's send queue
+    """
+    try:
+        while True:
+            payload = await queue.get()
+            await websocket.send_bytes(payload)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to send WebSocket update: {e}")
+        active_websockets.pop(websocket, None)
+
+
+async def broadcast_update(update: BroadcastUpdate):
     """
     Broadcast update to all connected WebSocket clients.
 
+    The update is serialized once and handed to each client's send queue;
+    the per-connection writer tasks do the actual sending.
+
     Args:
         update: Update data to broadcast
     """
     if not active_websockets:
         return
 
-    disconnected = set()
-
-    for websocket in active_websockets:
-        try:
-            await websocket.send_json(update)
-        except Exception as e:
-            logger.error(f"Failed to send WebSocket update: {e}")
-            disconnected.add(websocket)
+    payload = _update_encoder.encode(update)
 
-    # Remove disconnected clients
-    for websocket in disconnected:
-        active_websockets.discard(websocket)
+    for queue in active_websockets.values():
+        _enqueue_frame(queue, payload)
 
 
 # ============================================================================
@@ -509,41 +804,60 @@ async def periodic_updates():
     Periodic task to broadcast updated data to all WebSocket clients.
     Runs every update_interval seconds.
     """
+    cycle = 0
+
     while True:
         try:
             await asyncio.sleep(update_interval)
+            cycle += 1
 
             if not data_provider or not active_websockets:
                 continue
 
             # Get current positions and broadcast updates
-            positions = data_provider.get_positions()
-            portfolio = data_provider.get_portfolio_status()
+            positions = await provider_call("get_positions")
+            timestamp = current_timestamp
 
-            # Broadcast position updates
-            for position in positions:
-                await broadcast_update({
-                    'event_type': 'position_update',
-                    'data': position,
-                    'timestamp': datetime.now().isoformat()
-                })
+            # Broadcast all positions in a single frame
+            await broadcast_update(BroadcastUpdate(
+                event_type='positions_snapshot',
+                data=positions,
+                timestamp=timestamp
+            ))
 
             # Broadcast portfolio update every 10 cycles
-            if int(datetime.now().timestamp()) % (update_interval * 10) == 0:
-                await broadcast_update({
-                    'event_type': 'portfolio_update',
-                    'data': portfolio,
-                    'timestamp': datetime.now().isoformat()
-                })
+            if cycle % 10 == 0:
+                await broadcast_update(BroadcastUpdate(
+                    event_type='portfolio_update',
+                    data=await provider_call("get_portfolio_status"),
+                    timestamp=timestamp
+                ))
 
         except Exception as e:
             logger.error(f"Error in periodic updates: {e}")
 
 
+async def _tick_clock():
+    """Refresh current_timestamp once per second."""
+    global current_timestamp
+
+    while True:
+        current_timestamp = datetime.utcnow().isoformat()
+        await asyncio.sleep(1.0)
+
+
 @app.on_event("startup")
 async def startup_event():
     """Start background update task and verify authentication"""
-    global api_key_manager, rate_limiter
+    global data_provider, database, api_key_manager, rate_limiter
+
+    # Out-of-process worker: read from the agent over RPC
+    if data_provider is None and API_WORKERS > 1:
+        data_provider = AgentRPCClient(AGENT_RPC_SOCKET)
+        # The agent owns the key file; workers only read it
+        api_key_manager = APIKeyManager(read_only=True)
+        rate_limiter = get_rate_limiter()
+        logger.info(f"Worker {os.getpid()} connected to agent RPC at {AGENT_RPC_SOCKET}")
 
     # Initialize authentication if not already done
     if not api_key_manager:
@@ -552,6 +866,7 @@ async def startup_event():
         initialize_default_key()
         logger.info("Authentication initialized at startup")
 
+    asyncio.create_task(_tick_clock())
     asyncio.create_task(periodic_updates())
     logger.info("Periodic update task started")
 
@@ -565,9 +880,21 @@ if __name__ == "__main__":
     logger.info("API documentation available at http://localhost:8000/docs")
     logger.info("WebSocket available at ws://localhost:8000/ws/live")
 
+    # uvloop has no Windows build, so fall back to the stock asyncio loop there.
+    # With API_WORKERS > 1 the agent process owns the API key file (see
+    # initialize_agent_side): workers load it read-only, pick up changes
+    # within KEY_RELOAD_INTERVAL, send key creation/revocation to the agent
+    # and don't record key usage. Rate limiter buckets are per worker, so
+    # per-key limits apply per worker.
     uvicorn.run(
-        app,
+        "api_server:app",
         host="0.0.0.0",
         port=8000,
-        log_level="info"
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        ws="websockets",
+        ws_ping_interval=20,  # protocol-level keepalive; dead peers are dropped by the server
+        ws_ping_timeout=20,
+        log_level="info",
+        workers=API_WORKERS
     )
@@ -3,42 +3,105 @@ API Authentication and Security for RRRv1 Trading Dashboard
 Provides simple API key authentication for single-user system
 """
 
+import atexit
+import base64
+import functools
 import os
 import secrets
+import sys
 import logging
-from typing import Optional, Dict
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Hashable, Tuple
 from datetime import datetime, timedelta
 import hashlib
-import json
+import hmac
 from pathlib import Path
 
+import orjson
+
 logger = logging.getLogger(__name__)
 
 # Configuration
 API_KEY_FILE = "config/api_keys.json"
 API_KEY_HEADER = "X-API-Key"
-API_KEY_LENGTH = 32  # Number of random bytes for API key
+API_KEY_LENGTH = 24  # Bytes of entropy in an API key (32 url-safe chars)
+VERIFY_CACHE_TTL = 60  # seconds a successful verification is trusted
+VERIFY_CACHE_SIZE = 128  # max cached verifications
+KEY_FLUSH_INTERVAL = 5  # seconds between background writes of usage metadata
+KEY_RELOAD_INTERVAL = 1  # seconds between key file change checks in read-only managers
+BUCKET_IDLE_SECONDS = 3600  # idle time after which a rate-limit bucket is full and can be dropped
+
+# One-time notice printed when the default key is created
+_BANNER_TMPL = """
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                          INITIAL API KEY GENERATED                           ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+A default API key has been generated for you.
+
+API Key: {api_key}
+
+⚠️  SAVE THIS KEY SECURELY - IT WILL NOT BE SHOWN AGAIN!
+
+Add to your environment or .env file:
+    export API_KEY="{api_key}"
+
+Or pass it in requests:
+    curl -H "X-API-Key: {api_key}" http://localhost:8000/api/portfolio
+
+The key has been stored in: {key_file}
+
+╚══════════════════════════════════════════════════════════════════════════════╝
+"""
+
+# Per-process key for verification cache entries, so cache keys can't be precomputed
+_PROCESS_SECRET = secrets.token_bytes(32)
 
 
 class APIKeyManager:
     """
     Manage API keys for authentication.
     Stores hashed keys for security (never stores plaintext).
+
+    Only one process may write the key file. Other processes (multi-worker
+    API servers) use a read-only manager, which reloads the file when it
+    changes and does not record usage metadata.
     """
 
-    def __init__(self, key_file: str = API_KEY_FILE):
+    def __init__(self, key_file: str = API_KEY_FILE, read_only: bool = False):
         """
         Initialize API key manager.
 
         Args:
             key_file: Path to store API key hashes
+            read_only: Never write the key file; reload it when it changes
         """
         self.key_file = key_file
+        self.read_only = read_only
         Path(self.key_file).parent.mkdir(parents=True, exist_ok=True)
-        self._keys: Dict[str, Dict] = {}
+        self._keys: Dict[bytes, Dict] = {}  # SHA-256 digest -> metadata
+        self._verify_cache: "OrderedDict[bytes, Tuple[bytes, float]]" = OrderedDict()  # -> (key_hash, expiry)
+        self._dirty = False  # usage metadata changed since last save
+        self._save_lock = threading.RLock()  # guards _keys, counters and _dirty
+        self._write_lock = threading.Lock()  # serializes key file writes
+        self._enabled_keys = 0  # running counters behind get_key_stats
+        self._total_requests = 0
+        self._key_file_mtime: Optional[int] = None  # st_mtime_ns of the loaded file
+        self._last_reload_check = time.monotonic()
         self._load_keys()
 
-    def _hash_key(self, api_key: str) -> str:
+        # Usage metadata is flushed in the background and on exit, not per request
+        self._stop_flush = threading.Event()
+        self._flush_thread: Optional[threading.Thread] = None
+        if not read_only:
+            self._flush_thread = threading.Thread(target=self._flush_loop, name="api-key-flush", daemon=True)
+            self._flush_thread.start()
+            atexit.register(self.close)
+
+    def _hash_key_storage(self, api_key: str) -> bytes:
         """
         Hash an API key for secure storage.
 
@@ -46,16 +109,61 @@ class APIKeyManager:
             api_key: The API key to hash
 
         Returns:
-            SHA-256 hash of the key
+            32-byte SHA-256 digest of the key (base64-encoded on disk)
+        """
+        return hashlib.sha256(api_key.encode()).digest()
+
+    def _hash_key_lookup(self, api_key: str) -> bytes:
+        """
+        Hash an API key for the in-memory verification cache.
+
+        Keyed BLAKE2s is cheaper than SHA-256 on short inputs, and the
+        per-process key stops cache keys from being precomputed.
+
+        Args:
+            api_key: The API key to hash
+
+        Returns:
+            16-byte BLAKE2s digest of the key
+        """
+        return hashlib.blake2s(api_key.encode(), key=_PROCESS_SECRET, digest_size=16).digest()
+
+    def _find_key(self, api_key: str) -> Optional[bytes]:
+        """
+        Find the stored hash matching an API key in constant time.
+
+        Every stored hash is compared with hmac.compare_digest and there is
+        no early exit, so timing does not reveal whether or where a key matched.
+
+        Args:
+            api_key: The API key to look up
+
+        Returns:
+            The matching stored hash, or None if not found
         """
-        return hashlib.sha256(api_key.encode()).hexdigest()
+        candidate = self._hash_key_storage(api_key)
+        matched = None
+
+        for key_hash in self._keys:
+            if hmac.compare_digest(candidate, key_hash):
+                matched = key_hash
+
+        return matched
 
     def _load_keys(self) -> None:
         """Load API keys from file."""
         try:
+            self._key_file_mtime = self._stat_mtime()
             if Path(self.key_file).exists():
-                with open(self.key_file, 'r') as f:
-                    self._keys = json.load(f)
+                stored = orjson.loads(Path(self.key_file).read_bytes())
+                self._keys = {}
+                for encoded, info in stored.items():
+                    if len(encoded) == 64:
+                        # Older key files store hex digests; rewrite them as base64
+                        self._keys[bytes.fromhex(encoded)] = info
+                        self._dirty = True
+                    else:
+                        self._keys[base64.b64decode(encoded)] = info
                 logger.info(f"Loaded {len(self._keys)} API keys from {self.key_file}")
             else:
                 self._keys = {}
@@ -64,18 +172,91 @@ class APIKeyManager:
             logger.error(f"Failed to load API keys: {e}")
             self._keys = {}
 
+        self._enabled_keys = sum(1 for k in self._keys.values() if k.get("enabled", False))
+        self._total_requests = sum(k.get("request_count", 0) for k in self._keys.values())
+
+    def _stat_mtime(self) -> Optional[int]:
+        """Modification time of the key file in ns, or None if it doesn't exist."""
+        try:
+            return os.stat(self.key_file).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def reload(self) -> None:
+        """Reload keys from the key file, dropping cached verifications."""
+        with self._save_lock:
+            self._load_keys()
+            self._verify_cache.clear()
+
+    def _reload_if_changed(self) -> None:
+        """Reload a read-only manager's keys if the file changed (checked every KEY_RELOAD_INTERVAL)."""
+        now = time.monotonic()
+        if now - self._last_reload_check < KEY_RELOAD_INTERVAL:
+            return
+        self._last_reload_check = now
+
+        if self._stat_mtime() != self._key_file_mtime:
+            logger.info(f"API key file changed, reloading {self.key_file}")
+            self.reload()
+
+    def _check_writable(self) -> None:
+        """Raise if this manager may not modify the key file."""
+        if self.read_only:
+            raise RuntimeError("API keys are read-only in this process; change them in the owning process")
+
     def _save_keys(self) -> None:
-        """Save API keys to file."""
+        """Save API keys to file atomically (temp file + rename)."""
         try:
-            Path(self.key_file).parent.mkdir(parents=True, exist_ok=True)
-            with open(self.key_file, 'w') as f:
-                json.dump(self._keys, f, indent=2)
-            # Restrict file permissions to owner only
-            os.chmod(self.key_file, 0o600)
+            key_path = Path(self.key_file)
+            key_path.parent.mkdir(parents=True, exist_ok=True)
+
+            with self._write_lock:
+                # Snapshot under the save lock, then write without it so
+                # request-path usage updates never wait on the fsync
+                with self._save_lock:
+                    payload = orjson.dumps({
+                        base64.b64encode(key_hash).decode(): info
+                        for key_hash, info in self._keys.items()
+                    })
+                    self._dirty = False
+
+                # mkstemp creates the file owner-only (0600)
+                fd, tmp_path = tempfile.mkstemp(dir=key_path.parent, prefix=key_path.name, suffix=".tmp")
+                try:
+                    with os.fdopen(fd, 'wb') as f:
+                        f.write(payload)
+                        # Data must be on disk before the rename, or a crash can leave an empty file
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(tmp_path, key_path)
+                except BaseException:
+                    os.unlink(tmp_path)
+                    raise
+
             logger.debug(f"Saved API keys to {self.key_file}")
         except Exception as e:
+            self._dirty = True
             logger.error(f"Failed to save API keys: {e}")
 
+    def _flush_if_dirty(self) -> None:
+        """Save API keys if usage metadata changed since the last save."""
+        if self._dirty:
+            self._save_keys()
+
+    def _flush_loop(self) -> None:
+        """Background thread: flush usage metadata every KEY_FLUSH_INTERVAL seconds until closed."""
+        while not self._stop_flush.wait(KEY_FLUSH_INTERVAL):
+            self._flush_if_dirty()
+
+    def close(self) -> None:
+        """Stop the background flush and write any pending usage metadata."""
+        self._stop_flush.set()
+        if self._flush_thread is not None:
+            self._flush_thread.join()
+            self._flush_thread = None
+        if not self.read_only:
+            self._flush_if_dirty()
+
     def generate_key(self, name: str = "default") -> str:
         """
         Generate a new API key.
@@ -86,20 +267,25 @@ class APIKeyManager:
         Returns:
             The generated API key (plaintext - only shown once!)
         """
+        self._check_writable()
+
         # Generate random API key
-        api_key = f"rrr-{secrets.token_hex(API_KEY_LENGTH // 2)}"
+        api_key = "rrr-" + secrets.token_urlsafe(API_KEY_LENGTH)
 
         # Hash for storage
-        key_hash = self._hash_key(api_key)
-
-        # Store metadata
-        self._keys[key_hash] = {
-            "name": name,
-            "created_at": datetime.utcnow().isoformat(),
-            "last_used": None,
-            "enabled": True,
-            "request_count": 0
-        }
+        key_hash = self._hash_key_storage(api_key)
+
+        # Store metadata (under the save lock so a background flush never
+        # serializes the dict while it changes size)
+        with self._save_lock:
+            self._keys[key_hash] = {
+                "name": name,
+                "created_at": datetime.utcnow().isoformat(),
+                "last_used": None,
+                "enabled": True,
+                "request_count": 0
+            }
+            self._enabled_keys += 1
 
         self._save_keys()
         logger.info(f"Generated new API key: {name}")
@@ -110,15 +296,31 @@ class APIKeyManager:
         """
         Verify if an API key is valid.
 
+        Successful verifications are cached for VERIFY_CACHE_TTL seconds;
+        a cache hit skips the key scan. Usage metadata is updated in memory
+        and written by the background flush.
+
         Args:
             api_key: The API key to verify
 
         Returns:
             True if key is valid and enabled, False otherwise
         """
-        key_hash = self._hash_key(api_key)
+        if self.read_only:
+            self._reload_if_changed()
+
+        cache_key = self._hash_key_lookup(api_key)
+        now = time.monotonic()
+        cached = self._verify_cache.get(cache_key)
 
-        if key_hash not in self._keys:
+        if cached is not None and cached[1] > now:
+            self._verify_cache.move_to_end(cache_key)
+            self._record_use(cached[0])
+            return True
+
+        key_hash = self._find_key(api_key)
+
+        if key_hash is None:
             logger.warning(f"Invalid API key attempted")
             return False
 
@@ -128,13 +330,35 @@ class APIKeyManager:
             logger.warning(f"Disabled API key used: {key_info.get('name')}")
             return False
 
-        # Update last used timestamp
-        self._keys[key_hash]["last_used"] = datetime.utcnow().isoformat()
-        self._keys[key_hash]["request_count"] = key_info.get("request_count", 0) + 1
-        self._save_keys()
+        self._verify_cache[cache_key] = (key_hash, now + VERIFY_CACHE_TTL)
+        self._verify_cache.move_to_end(cache_key)
+        if len(self._verify_cache) > VERIFY_CACHE_SIZE:
+            self._verify_cache.popitem(last=False)
 
+        self._record_use(key_hash)
         return True
 
+    def _record_use(self, key_hash: bytes) -> None:
+        """
+        Update a key's usage metadata after a successful verification.
+        Read-only managers don't track usage.
+
+        Args:
+            key_hash: Stored hash of the verified key
+        """
+        if self.read_only:
+            return
+
+        # Under the save lock, so a concurrent flush either writes this
+        # update or leaves _dirty set for the next one
+        with self._save_lock:
+            key_info = self._keys[key_hash]
+            # Epoch seconds, formatted in list_keys
+            key_info["last_used"] = int(time.time())
+            key_info["request_count"] = key_info.get("request_count", 0) + 1
+            self._total_requests += 1
+            self._dirty = True
+
     def revoke_key(self, api_key: str) -> bool:
         """
         Revoke an API key (disable it).
@@ -145,18 +369,50 @@ class APIKeyManager:
         Returns:
             True if revoked, False if not found
         """
-        key_hash = self._hash_key(api_key)
+        self._check_writable()
+        key_hash = self._find_key(api_key)
 
-        if key_hash not in self._keys:
+        if key_hash is None:
             logger.error(f"API key not found for revocation")
             return False
 
-        self._keys[key_hash]["enabled"] = False
+        with self._save_lock:
+            if self._keys[key_hash].get("enabled", False):
+                self._enabled_keys -= 1
+            self._keys[key_hash]["enabled"] = False
+        self._verify_cache.clear()
         self._save_keys()
         logger.info(f"API key revoked: {self._keys[key_hash].get('name')}")
 
         return True
 
+    def revoke_key_by_name(self, name: str) -> bool:
+        """
+        Revoke (disable) every API key with the given name.
+
+        Args:
+            name: Key name, as shown by list_keys
+
+        Returns:
+            True if a key with that name exists, False otherwise
+        """
+        self._check_writable()
+
+        with self._save_lock:
+            matched = [info for info in self._keys.values() if info.get("name") == name]
+            for info in matched:
+                if info.get("enabled", False):
+                    self._enabled_keys -= 1
+                info["enabled"] = False
+
+        if not matched:
+            return False
+
+        self._verify_cache.clear()
+        self._save_keys()
+        logger.info(f"API key revoked: {name}")
+        return True
+
     def list_keys(self) -> list:
         """
         List all API keys (without showing the actual keys).
@@ -164,12 +420,19 @@ class APIKeyManager:
         Returns:
             List of key metadata
         """
+        if self.read_only:
+            self._reload_if_changed()
+
         keys_list = []
         for key_hash, info in self._keys.items():
+            last_used = info.get("last_used")
+            if isinstance(last_used, int):
+                last_used = datetime.utcfromtimestamp(last_used).isoformat()
+
             keys_list.append({
                 "name": info.get("name"),
                 "created_at": info.get("created_at"),
-                "last_used": info.get("last_used"),
+                "last_used": last_used,
                 "enabled": info.get("enabled"),
                 "request_count": info.get("request_count", 0)
             })
@@ -177,9 +440,12 @@ class APIKeyManager:
 
     def get_key_stats(self) -> Dict:
         """Get statistics about API keys."""
+        if self.read_only:
+            self._reload_if_changed()
+
         total_keys = len(self._keys)
-        enabled_keys = sum(1 for k in self._keys.values() if k.get("enabled", False))
-        total_requests = sum(k.get("request_count", 0) for k in self._keys.values())
+        enabled_keys = self._enabled_keys
+        total_requests = self._total_requests
 
         return {
             "total_keys": total_keys,
@@ -191,8 +457,9 @@ class APIKeyManager:
 
 class RateLimiter:
     """
-    Simple rate limiter for API requests.
-    Tracks requests per key and enforces limits.
+    Token-bucket rate limiter for API requests.
+    Each key gets a per-minute and a per-hour bucket that refill continuously,
+    so a check is a couple of float operations instead of a scan of past requests.
     """
 
     def __init__(self, requests_per_minute: int = 100, requests_per_hour: int = 10000):
@@ -205,59 +472,84 @@ class RateLimiter:
         """
         self.requests_per_minute = requests_per_minute
         self.requests_per_hour = requests_per_hour
-        self._request_log: Dict[str, list] = {}  # api_key -> [(timestamp, endpoint), ...]
+        self._minute_refill_rate = requests_per_minute / 60.0  # tokens per second
+        self._hour_refill_rate = requests_per_hour / 3600.0  # tokens per second
+        self._buckets: Dict[Hashable, list] = {}  # bucket key -> [minute_tokens, hour_tokens, last_refill]
+        self._last_sweep = time.monotonic()
 
-    def is_allowed(self, api_key: str, endpoint: str = None) -> tuple:
+    def _refill(self, bucket: list, now: float) -> None:
+        """
+        Top up a bucket for the time elapsed since its last refill.
+
+        Args:
+            bucket: [minute_tokens, hour_tokens, last_refill] entry to update in place
+            now: Current time.monotonic() value
+        """
+        elapsed = now - bucket[2]
+        bucket[0] = min(self.requests_per_minute, bucket[0] + elapsed * self._minute_refill_rate)
+        bucket[1] = min(self.requests_per_hour, bucket[1] + elapsed * self._hour_refill_rate)
+        bucket[2] = now
+
+    def _evict_idle(self, now: float) -> None:
+        """
+        Drop buckets that have been idle for BUCKET_IDLE_SECONDS.
+
+        Such buckets have refilled completely, and a missing bucket is
+        recreated full, so eviction never changes a limiting decision.
+
+        Args:
+            now: Current time.monotonic() value
+        """
+        cutoff = now - BUCKET_IDLE_SECONDS
+        for key in [k for k, bucket in self._buckets.items() if bucket[2] <= cutoff]:
+            del self._buckets[key]
+        self._last_sweep = now
+
+    def is_allowed(self, api_key: Hashable, endpoint: str = None) -> tuple:
         """
         Check if a request is allowed under rate limits.
 
         Args:
-            api_key: The API key making the request
+            api_key: The API key making the request, or a derived bucket key
             endpoint: The endpoint being accessed (optional)
 
         Returns:
-            Tuple of (is_allowed: bool, remaining_requests: int, reset_time: datetime)
+            Tuple of (is_allowed: bool, remaining_requests: int, reset_time: datetime).
+            reset_time is only computed when the request is rejected, otherwise None.
         """
-        now = datetime.utcnow()
+        now = time.monotonic()
+        if now - self._last_sweep >= BUCKET_IDLE_SECONDS:
+            self._evict_idle(now)
 
-        if api_key not in self._request_log:
-            self._request_log[api_key] = []
+        bucket = self._buckets.get(api_key)
 
-        # Clean up old requests
-        minute_ago = now - timedelta(minutes=1)
-        hour_ago = now - timedelta(hours=1)
-
-        self._request_log[api_key] = [
-            (ts, ep) for ts, ep in self._request_log[api_key]
-            if ts > hour_ago
-        ]
+        if bucket is None:
+            bucket = [float(self.requests_per_minute), float(self.requests_per_hour), now]
+            self._buckets[api_key] = bucket
+        else:
+            self._refill(bucket, now)
 
         # Check minute limit
-        recent_minute = [
-            (ts, ep) for ts, ep in self._request_log[api_key]
-            if ts > minute_ago
-        ]
-
-        if len(recent_minute) >= self.requests_per_minute:
-            remaining = max(0, self.requests_per_minute - len(recent_minute))
-            reset_time = recent_minute[0][0] + timedelta(minutes=1)
-            return False, remaining, reset_time
+        if bucket[0] < 1:
+            wait = (1 - bucket[0]) / self._minute_refill_rate
+            return False, 0, datetime.utcnow() + timedelta(seconds=wait)
 
         # Check hour limit
-        if len(self._request_log[api_key]) >= self.requests_per_hour:
-            remaining = max(0, self.requests_per_hour - len(self._request_log[api_key]))
-            reset_time = self._request_log[api_key][0][0] + timedelta(hours=1)
-            return False, remaining, reset_time
+        if bucket[1] < 1:
+            wait = (1 - bucket[1]) / self._hour_refill_rate
+            return False, 0, datetime.utcnow() + timedelta(seconds=wait)
 
-        # Request allowed, log it
-        self._request_log[api_key].append((now, endpoint))
-        remaining = self.requests_per_minute - len(recent_minute) - 1
+        # Request allowed, take a token from each bucket
+        bucket[0] -= 1
+        bucket[1] -= 1
 
-        return True, remaining, now + timedelta(minutes=1)
+        return True, int(bucket[0]), None
 
-    def get_usage(self, api_key: str) -> Dict:
+    def get_usage(self, api_key: Hashable) -> Dict:
         """Get request usage for an API key."""
-        if api_key not in self._request_log:
+        bucket = self._buckets.get(api_key)
+
+        if bucket is None:
             return {
                 "requests_this_minute": 0,
                 "requests_this_hour": 0,
@@ -265,18 +557,11 @@ class RateLimiter:
                 "limit_hour": self.requests_per_hour
             }
 
-        now = datetime.utcnow()
-        minute_ago = now - timedelta(minutes=1)
-        hour_ago = now - timedelta(hours=1)
+        self._refill(bucket, time.monotonic())
 
-        requests_minute = sum(
-            1 for ts, _ in self._request_log[api_key]
-            if ts > minute_ago
-        )
-        requests_hour = sum(
-            1 for ts, _ in self._request_log[api_key]
-            if ts > hour_ago
-        )
+        # Spent tokens that have not refilled yet approximate the recent request count
+        requests_minute = round(self.requests_per_minute - bucket[0])
+        requests_hour = round(self.requests_per_hour - bucket[1])
 
         return {
             "requests_this_minute": requests_minute,
@@ -288,28 +573,20 @@ class RateLimiter:
         }
 
 
-# Global instances
-_api_key_manager: Optional[APIKeyManager] = None
-_rate_limiter: Optional[RateLimiter] = None
-
-
+# Global instances (built on first call, then cached)
+@functools.cache
 def get_api_key_manager() -> APIKeyManager:
     """Get or create the API key manager."""
-    global _api_key_manager
-    if _api_key_manager is None:
-        _api_key_manager = APIKeyManager()
-    return _api_key_manager
+    return APIKeyManager()
 
 
+@functools.cache
 def get_rate_limiter() -> RateLimiter:
     """Get or create the rate limiter."""
-    global _rate_limiter
-    if _rate_limiter is None:
-        _rate_limiter = RateLimiter(
-            requests_per_minute=100,
-            requests_per_hour=10000
-        )
-    return _rate_limiter
+    return RateLimiter(
+        requests_per_minute=100,
+        requests_per_hour=10000
+    )
 
 
 def initialize_default_key() -> None:
@@ -321,24 +598,5 @@ def initialize_default_key() -> None:
 
     if len(manager._keys) == 0:
         api_key = manager.generate_key("default")
-        logger.warning(f"""
-╔══════════════════════════════════════════════════════════════════════════════╗
-║                          INITIAL API KEY GENERATED                           ║
-╚══════════════════════════════════════════════════════════════════════════════╝
-
-A default API key has been generated for you.
-
-API Key: {api_key}
-
-⚠️  SAVE THIS KEY SECURELY - IT WILL NOT BE SHOWN AGAIN!
-
-Add to your environment or .env file:
-    export API_KEY="{api_key}"
-
-Or pass it in requests:
-    curl -H "X-API-Key: {api_key}" http://localhost:8000/api/portfolio
-
-The key has been stored in: {API_KEY_FILE}
-
-╚══════════════════════════════════════════════════════════════════════════════╝
-        """)
+        sys.stderr.write(_BANNER_TMPL.format(api_key=api_key, key_file=manager.key_file))
+        logger.warning("Initial API key generated; see stderr")
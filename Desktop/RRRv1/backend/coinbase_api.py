@@ -12,18 +12,74 @@ Handles:
 
 import asyncio
 import logging
-import hmac
 import hashlib
-import json
+import random
+import ssl
 import time
-from typing import Dict, List, Optional, Any
+from functools import lru_cache
+from operator import itemgetter
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 import aiohttp
+import numpy as np
+import orjson
 from dataclasses import dataclass
 from enum import Enum
 
 logger = logging.getLogger(__name__)
 
+ORDER_CONCURRENCY = 20  # max in-flight orders from batch helpers
+PRICE_CACHE_TTL = 0.25  # seconds a fetched price is reused
+PRODUCT_CACHE_TTL = 300.0  # seconds product metadata (increments, status) is reused
+
+# Retry policy for transient API errors
+MAX_REQUEST_ATTEMPTS = 3
+MAX_RETRY_DELAY = 2.0  # seconds; longer Retry-After values are not waited out
+_RETRYABLE_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+# Numeric CoinbasePosition fields and their defaults, for column views
+_POSITION_COLUMNS = (
+    ("size", 0), ("entry_price", 0), ("current_price", 0),
+    ("leverage", 1), ("unrealized_pnl", 0), ("unrealized_pnl_pct", 0)
+)
+
+LARGE_RESPONSE_BYTES = 1 << 20  # bodies above this (e.g. level-3 books) are parsed off the event loop
+
+
+class CoinbaseAPIError(Exception):
+    """Error response from the Coinbase API"""
+
+    def __init__(self, status: int, data: Any):
+        super().__init__(f"API error ({status}): {data}")
+        self.status = status
+        self.data = data
+
+
+@lru_cache(maxsize=None)
+def _log_sha_acceleration() -> bool:
+    """
+    Log once whether the CPU exposes SHA-256 instructions.
+
+    Request signing is SHA-256 bound; OpenSSL uses SHA-NI (x86) or the
+    ARMv8 SHA2 extension automatically when the CPU reports it.
+
+    Returns:
+        True if hardware SHA-256 is available
+    """
+    try:
+        with open("/proc/cpuinfo") as f:
+            flags = set(f.read().split())
+    except OSError:
+        logger.debug("SHA acceleration unknown: /proc/cpuinfo not readable")
+        return False
+
+    accelerated = "sha_ni" in flags or "sha2" in flags
+    if accelerated:
+        logger.info(f"SHA-256 hardware acceleration available ({ssl.OPENSSL_VERSION})")
+    else:
+        logger.warning(f"No SHA-256 CPU extensions detected; request signing uses scalar code ({ssl.OPENSSL_VERSION})")
+    return accelerated
+
 
 class OrderType(Enum):
     """Order types supported by Coinbase"""
@@ -48,12 +104,99 @@ class OrderStatus(Enum):
     FAILED = "FAILED"
 
 
-@dataclass
+# Request-body strings for order enums (plain dict lookups instead of Enum.value)
+_SIDE_STR = {side: side.value for side in OrderSide}
+_TYPE_STR = {order_type: order_type.value for order_type in OrderType}
+
+# Order enums by API string, for parsing responses without raising on unknown values
+_SIDE_FROM_STR = {side.value: side for side in OrderSide}
+_STATUS_FROM_STR = {status.value: status for status in OrderStatus}
+
+# Order fields pulled from API order records in one call, with their defaults
+_ORDER_DEFAULTS = {
+    "order_id": None, "product_id": None, "side": None, "order_type": None,
+    "size": 0, "price": None, "status": None, "filled_size": 0,
+    "average_filled_price": None, "created_time": "", "updated_time": ""
+}
+_ORDER_FIELDS = itemgetter(*_ORDER_DEFAULTS)
+
+# Side that flattens a position, indexed by (size < 0): long -> SELL, short -> BUY
+_CLOSE_SIDE = (OrderSide.SELL, OrderSide.BUY)
+
+
+def _format_decimal(value: float) -> str:
+    """
+    Format a size or price as a plain decimal string.
+
+    str() switches to scientific notation for small values (1e-05),
+    which the API rejects.
+
+    Args:
+        value: Number to format
+
+    Returns:
+        Decimal string with up to 8 places and no trailing zeros
+    """
+    return format(value, ".8f").rstrip("0").rstrip(".")
+
+
+def _order_fields(order_data: Dict[str, Any]) -> Tuple:
+    """
+    Pull the _ORDER_DEFAULTS fields from an API order record.
+
+    Complete records (the usual case) go straight through _ORDER_FIELDS;
+    only records missing a field are merged over the defaults.
+
+    Args:
+        order_data: Order record from the API
+
+    Returns:
+        Field values in _ORDER_DEFAULTS order
+    """
+    try:
+        return _ORDER_FIELDS(order_data)
+    except KeyError:
+        return _ORDER_FIELDS({**_ORDER_DEFAULTS, **order_data})
+
+
+def _safe_float(value: Any, default: float = 0.0) -> float:
+    """
+    Parse a numeric API field, returning default if it is missing or malformed.
+
+    Args:
+        value: Field value (number, numeric string or None)
+        default: Value to use when it cannot be parsed
+
+    Returns:
+        Parsed float or default
+    """
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _book_levels_to_array(levels: List[list]) -> np.ndarray:
+    """
+    Convert orderbook levels to a price/size array.
+
+    Args:
+        levels: [[price, size, num_orders | order_id], ...] with string numbers
+
+    Returns:
+        (N, 2) float64 array of [price, size]
+    """
+    if not levels:
+        return np.empty((0, 2), dtype=np.float64)
+    return np.array([level[:2] for level in levels], dtype=np.float64)
+
+
+@dataclass(slots=True, frozen=True)
 class CoinbaseOrder:
     """Represents a Coinbase order"""
     order_id: str
     product_id: str
-    side: OrderSide
+    side: Optional[OrderSide]  # None only if a close-position response omitted it
     order_type: OrderType
     size: float
     price: Optional[float]
@@ -64,7 +207,7 @@ class CoinbaseOrder:
     updated_time: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CoinbasePosition:
     """Represents a margin/leveraged position on Coinbase"""
     product_id: str
@@ -77,7 +220,7 @@ class CoinbasePosition:
     timestamp: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CoinbaseBalance:
     """Account balance information"""
     total_balance: float
@@ -116,9 +259,33 @@ class CoinbaseAPIClient:
         self.request_timeout = request_timeout
         self.base_url = "https://api.exchange.coinbase.com"
 
+        # HMAC-SHA256 inner/outer hash states primed with the padded secret,
+        # copied per signature instead of re-deriving the pads each request
+        key = api_secret.encode()
+        if len(key) > 64:
+            key = hashlib.sha256(key).digest()
+        key = key.ljust(64, b"\0")
+        self._hmac_inner = hashlib.sha256(bytes(b ^ 0x36 for b in key))
+        self._hmac_outer = hashlib.sha256(bytes(b ^ 0x5C for b in key))
+
+        # Cleared once the API shows it does not honour close-position orders
+        self._close_orders_supported = True
+
         # Session for connection pooling
         self.session: Optional[aiohttp.ClientSession] = None
 
+        # Last request timestamp (epoch seconds, str, bytes), reused within a second
+        self._last_ts: Tuple[int, str, bytes] = (0, "0", b"0")
+
+        # Bounds concurrent order placement in batch helpers
+        self._order_semaphore = asyncio.Semaphore(ORDER_CONCURRENCY)
+
+        # Market data caches
+        self._product_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}  # product_id -> (monotonic time, product data)
+        self._price_cache: Dict[str, Tuple[float, float]] = {}  # product_id -> (monotonic time, price)
+        self._price_requests: Dict[str, asyncio.Future] = {}  # in-flight price fetches
+
+        _log_sha_acceleration()
         logger.info("Coinbase API client initialized")
 
     async def __aenter__(self):
@@ -131,9 +298,20 @@ class CoinbaseAPIClient:
         await self.disconnect()
 
     async def connect(self) -> None:
-        """Create HTTP session"""
+        """Create HTTP session with a bounded keep-alive connection pool"""
         if self.session is None:
-            self.session = aiohttp.ClientSession()
+            connector = aiohttp.TCPConnector(
+                limit=100,
+                limit_per_host=30,
+                keepalive_timeout=75,  # reuse TLS connections between calls
+                ttl_dns_cache=300,
+                enable_cleanup_closed=True
+            )
+            self.session = aiohttp.ClientSession(
+                base_url=self.base_url,
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.request_timeout)
+            )
             logger.info("Connected to Coinbase API")
 
     async def disconnect(self) -> None:
@@ -144,30 +322,44 @@ class CoinbaseAPIClient:
             logger.info("Disconnected from Coinbase API")
 
     def _generate_signature(self,
-                           request_path: str,
-                           body: str,
-                           timestamp: str,
-                           method: str) -> str:
+                           request_path: bytes,
+                           body: bytes,
+                           timestamp: bytes,
+                           method: bytes) -> str:
         """
         Generate HMAC-SHA256 signature for API request.
 
         Args:
-            request_path: API endpoint path
-            body: Request body JSON string
-            timestamp: Request timestamp
-            method: HTTP method
+            request_path: API endpoint path (encoded)
+            body: Request body JSON bytes
+            timestamp: Request timestamp (encoded)
+            method: HTTP method (encoded)
 
         Returns:
             Signature string
         """
-        message = timestamp + method + request_path + body
-        signature = hmac.new(
-            self.api_secret.encode(),
-            message.encode(),
-            hashlib.sha256
-        ).hexdigest()
+        message = b"".join((timestamp, method, request_path, body))
+
+        inner = self._hmac_inner.copy()
+        inner.update(message)
+        outer = self._hmac_outer.copy()
+        outer.update(inner.digest())
+
+        return outer.hexdigest()
+
+    def _timestamp(self) -> Tuple[str, bytes]:
+        """
+        Get the request timestamp in epoch seconds.
 
-        return signature
+        Returns:
+            Tuple of (header string, signing bytes); reused for requests
+            made within the same second
+        """
+        now = time.time_ns() // 1_000_000_000
+        if now != self._last_ts[0]:
+            text = str(now)
+            self._last_ts = (now, text, text.encode("ascii"))
+        return self._last_ts[1], self._last_ts[2]
 
     async def _request(self,
                       method: str,
@@ -185,59 +377,102 @@ class CoinbaseAPIClient:
             Response JSON
 
         Raises:
-            Exception: On API error
+            CoinbaseAPIError: On API error response
+            Exception: On transport error
         """
         if not self.session:
             raise RuntimeError("Not connected to API. Call connect() first.")
 
-        url = f"{self.base_url}{path}"
-        body_str = json.dumps(body) if body else ""
-        timestamp = str(int(time.time()))
+        if method not in ("GET", "POST"):
+            raise ValueError(f"Unsupported HTTP method: {method}")
+
+        body_bytes = orjson.dumps(body) if body else b""
+        path_bytes = path.encode()
+        method_bytes = method.encode("ascii")
+
+        # Retries reuse the session, so kept-alive connections survive them
+        for attempt in range(MAX_REQUEST_ATTEMPTS):
+            timestamp, timestamp_bytes = self._timestamp()
+            headers = {
+                "CB-ACCESS-KEY": self.api_key,
+                "CB-ACCESS-SIGN": self._generate_signature(path_bytes, body_bytes, timestamp_bytes, method_bytes),
+                "CB-ACCESS-TIMESTAMP": timestamp,
+                "Content-Type": "application/json"
+            }
 
-        signature = self._generate_signature(path, body_str, timestamp, method)
+            try:
+                # Send exactly the body that was signed
+                async with self.session.request(
+                    method, path, data=body_bytes or None, headers=headers
+                ) as response:
+                    status = response.status
+                    retry_after = response.headers.get("Retry-After")
+                    raw = await response.read()
+            except asyncio.TimeoutError:
+                logger.error(f"API request timeout: {path}")
+                raise
+            except Exception as e:
+                logger.error(f"API request failed: {e}")
+                raise
+
+            try:
+                if len(raw) > LARGE_RESPONSE_BYTES:
+                    data = await asyncio.to_thread(orjson.loads, raw)
+                else:
+                    data = orjson.loads(raw) if raw else {}
+            except orjson.JSONDecodeError:
+                # Gateways can answer 5xx with an HTML page
+                data = raw.decode(errors="replace")
+
+            if status in (200, 201):
+                return data
+
+            delay = self._retry_delay(method, status, retry_after, attempt)
+            if delay is None:
+                logger.error(f"API error ({status}): {data}")
+                raise CoinbaseAPIError(status, data)
+
+            logger.warning(f"API error ({status}) on {method} {path}, retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def _retry_delay(method: str,
+                     status: int,
+                     retry_after: Optional[str],
+                     attempt: int) -> Optional[float]:
+        """
+        Decide whether a failed request is retried, and after how long.
 
-        headers = {
-            "CB-ACCESS-KEY": self.api_key,
-            "CB-ACCESS-SIGN": signature,
-            "CB-ACCESS-TIMESTAMP": timestamp,
-            "Content-Type": "application/json"
-        }
+        Only GETs are retried on server errors; a POST may already have
+        placed an order, so it is retried only on 429 (not processed).
 
-        try:
-            if method == "GET":
-                async with self.session.get(
-                    url,
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=self.request_timeout)
-                ) as response:
-                    data = await response.json()
-                    if response.status != 200:
-                        logger.error(f"API error ({response.status}): {data}")
-                        raise Exception(f"API error: {data}")
-                    return data
-
-            elif method == "POST":
-                async with self.session.post(
-                    url,
-                    json=body or {},
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=self.request_timeout)
-                ) as response:
-                    data = await response.json()
-                    if response.status not in [200, 201]:
-                        logger.error(f"API error ({response.status}): {data}")
-                        raise Exception(f"API error: {data}")
-                    return data
+        Args:
+            method: HTTP method
+            status: Response status code
+            retry_after: Retry-After header value, if any
+            attempt: Zero-based attempt number that failed
 
-            else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
+        Returns:
+            Delay in seconds, or None if the request should not be retried
+        """
+        if attempt + 1 >= MAX_REQUEST_ATTEMPTS or status not in _RETRYABLE_STATUSES:
+            return None
+        if method != "GET" and status != 429:
+            return None
 
-        except asyncio.TimeoutError:
-            logger.error(f"API request timeout: {path}")
-            raise
-        except Exception as e:
-            logger.error(f"API request failed: {e}")
-            raise
+        # Exponential backoff with jitter
+        delay = min(0.1 * 2 ** attempt, MAX_RETRY_DELAY) + random.random() * 0.05
+
+        if retry_after:
+            try:
+                requested = float(retry_after)
+            except ValueError:
+                requested = 0.0
+            if requested > MAX_RETRY_DELAY:
+                return None
+            delay = max(delay, requested)
+
+        return delay
 
     # ========================================================================
     # Account Information
@@ -268,14 +503,11 @@ class CoinbaseAPIClient:
         try:
             accounts = await self.get_account_info()
 
-            total_balance = sum(
-                float(acc.get("balance", 0))
-                for acc in accounts.get("accounts", [])
-            )
-            available_balance = sum(
-                float(acc.get("available_balance", 0))
-                for acc in accounts.get("accounts", [])
-            )
+            # Single pass over sub-accounts for both totals
+            total_balance = available_balance = 0.0
+            for acc in accounts.get("accounts", ()):
+                total_balance += float(acc.get("balance") or 0)
+                available_balance += float(acc.get("available_balance") or 0)
 
             balance = CoinbaseBalance(
                 total_balance=total_balance,
@@ -326,6 +558,34 @@ class CoinbaseAPIClient:
             logger.error(f"Failed to get open positions: {e}")
             raise
 
+    async def get_open_positions_arrays(self) -> Dict[str, Any]:
+        """
+        Get all open positions as numeric columns.
+
+        Skips building CoinbasePosition objects for callers that only need
+        the numbers (e.g. portfolio-wide exposure or PnL sums).
+
+        Returns:
+            Dict with "product_id" (list of str) and one float64 array per
+            numeric position field, all aligned by index
+        """
+        try:
+            response = await self._request("GET", "/v1/positions")
+        except Exception as e:
+            logger.error(f"Failed to get open positions: {e}")
+            raise
+
+        raw = response.get("positions", [])
+        columns: Dict[str, Any] = {"product_id": [pos.get("product_id") for pos in raw]}
+        for field, default in _POSITION_COLUMNS:
+            columns[field] = np.fromiter(
+                (float(pos.get(field, default)) for pos in raw),
+                dtype=np.float64,
+                count=len(raw)
+            )
+
+        return columns
+
     async def get_position(self, product_id: str) -> Optional[CoinbasePosition]:
         """
         Get specific margin position.
@@ -384,15 +644,15 @@ class CoinbaseAPIClient:
         try:
             body = {
                 "product_id": product_id,
-                "side": side.value,
-                "order_type": order_type.value,
+                "side": _SIDE_STR[side],
+                "order_type": _TYPE_STR[order_type],
                 "post_only": post_only
             }
 
             if size:
-                body["size"] = str(size)
+                body["size"] = _format_decimal(size)
             if price:
-                body["price"] = str(price)
+                body["price"] = _format_decimal(price)
 
             response = await self._request("POST", "/v1/orders", body)
 
@@ -454,18 +714,20 @@ class CoinbaseAPIClient:
 
             orders = []
             for order_data in response.get("orders", []):
+                (order_id, order_product_id, side, order_type, size, price, status,
+                 filled_size, average_filled_price, created_time, updated_time) = _order_fields(order_data)
                 order = CoinbaseOrder(
-                    order_id=order_data.get("order_id"),
-                    product_id=order_data.get("product_id"),
-                    side=OrderSide(order_data.get("side")),
-                    order_type=OrderType(order_data.get("order_type")),
-                    size=float(order_data.get("size", 0)),
-                    price=order_data.get("price"),
-                    status=OrderStatus(order_data.get("status")),
-                    filled_size=float(order_data.get("filled_size", 0)),
-                    average_filled_price=order_data.get("average_filled_price"),
-                    created_time=order_data.get("created_time", ""),
-                    updated_time=order_data.get("updated_time", "")
+                    order_id=order_id,
+                    product_id=order_product_id,
+                    side=OrderSide(side),
+                    order_type=OrderType(order_type),
+                    size=float(size),
+                    price=price,
+                    status=OrderStatus(status),
+                    filled_size=float(filled_size),
+                    average_filled_price=average_filled_price,
+                    created_time=created_time,
+                    updated_time=updated_time
                 )
                 orders.append(order)
 
@@ -483,14 +745,23 @@ class CoinbaseAPIClient:
         """
         Get product information.
 
+        Product metadata (increments, min size, trading status) changes
+        rarely, so responses are reused for PRODUCT_CACHE_TTL seconds. Use
+        get_price for a current price.
+
         Args:
             product_id: Product identifier (e.g., "BTC-USD")
 
         Returns:
             Product data dictionary
         """
+        cached = self._product_cache.get(product_id)
+        if cached is not None and time.monotonic() - cached[0] < PRODUCT_CACHE_TTL:
+            return cached[1]
+
         try:
             response = await self._request("GET", f"/v1/products/{product_id}")
+            self._product_cache[product_id] = (time.monotonic(), response)
             return response
         except Exception as e:
             logger.error(f"Failed to get product {product_id}: {e}")
@@ -500,15 +771,71 @@ class CoinbaseAPIClient:
         """
         Get current price for a product.
 
+        Prices are reused for PRICE_CACHE_TTL seconds, and concurrent
+        lookups of the same product share a single request.
+
         Args:
             product_id: Product identifier
 
         Returns:
             Current price or None
         """
+        cached = self._price_cache.get(product_id)
+        if cached is not None and time.monotonic() - cached[0] < PRICE_CACHE_TTL:
+            return cached[1]
+
+        pending = self._price_requests.get(product_id)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._price_requests[product_id] = future
+        try:
+            price = await self._fetch_price(product_id)
+        except BaseException:
+            # Only cancellation gets here (_fetch_price returns None on
+            # errors). Waiters were not cancelled themselves, so hand them
+            # an ordinary error instead of a CancelledError.
+            future.set_exception(RuntimeError(f"Price request for {product_id} was cancelled"))
+            future.exception()  # Waiters re-raise it; don't log it as unretrieved
+            raise
+        finally:
+            del self._price_requests[product_id]
+
+        future.set_result(price)
+        return price
+
+    async def get_prices_bulk(self, product_ids: List[str]) -> Dict[str, Optional[float]]:
+        """
+        Get current prices for several products concurrently.
+
+        Args:
+            product_ids: Product identifiers
+
+        Returns:
+            Dict of product_id -> current price or None
+        """
+        unique_ids = list(dict.fromkeys(product_ids))
+        prices = await asyncio.gather(*(self.get_price(product_id) for product_id in unique_ids))
+        return dict(zip(unique_ids, prices))
+
+    async def _fetch_price(self, product_id: str) -> Optional[float]:
+        """
+        Fetch a fresh price and refresh the price and product caches.
+
+        Args:
+            product_id: Product identifier
+
+        Returns:
+            Current price or None on error
+        """
         try:
-            product = await self.get_product(product_id)
-            return float(product.get("price", 0))
+            product = await self._request("GET", f"/v1/products/{product_id}")
+            now = time.monotonic()
+            self._product_cache[product_id] = (now, product)
+            price = float(product.get("price", 0))
+            self._price_cache[product_id] = (now, price)
+            return price
         except Exception as e:
             logger.error(f"Failed to get price for {product_id}: {e}")
             return None
@@ -540,6 +867,23 @@ class CoinbaseAPIClient:
             logger.error(f"Failed to get orderbook for {product_id}: {e}")
             raise
 
+    async def get_orderbook_arrays(self, product_id: str, level: int = 2) -> Dict[str, Any]:
+        """
+        Get orderbook with bids/asks as numeric arrays.
+
+        Args:
+            product_id: Product identifier
+            level: Detail level (1=best bid/ask, 2=top 50, 3=full)
+
+        Returns:
+            Orderbook data with bids and asks as (N, 2) float64 arrays of
+            [price, size], best level first
+        """
+        book = await self.get_orderbook(product_id, level)
+        book["bids"] = _book_levels_to_array(book["bids"])
+        book["asks"] = _book_levels_to_array(book["asks"])
+        return book
+
     # ========================================================================
     # Helper Methods
     # ========================================================================
@@ -560,23 +904,146 @@ class CoinbaseAPIClient:
                 logger.warning(f"No position to close for {product_id}")
                 return None
 
-            # Close with opposite side
-            side = OrderSide.SELL if position.size > 0 else OrderSide.BUY
-            size = abs(position.size)
+            return await self._place_close(position)
 
+        except Exception as e:
+            logger.error(f"Failed to close position for {product_id}: {e}")
+            raise
+
+    async def close_position_atomic(self, product_id: str) -> Optional[CoinbaseOrder]:
+        """
+        Close an open margin position with a single close-position order.
+
+        Saves the /v1/positions round trip of close_position. Falls back to
+        close_position when the API rejects the close flags (400/422,
+        nothing executed), or when it accepts the order without sizing it
+        from the position; the unsized order is cancelled first and later
+        calls go straight to the two-step close.
+
+        Once the order is accepted this does not raise: response fields
+        that are missing or malformed get safe defaults.
+
+        Args:
+            product_id: Product to close
+
+        Returns:
+            Order object or None if no position
+        """
+        if not self._close_orders_supported:
+            return await self.close_position(product_id)
+
+        body = {
+            "product_id": product_id,
+            "order_type": _TYPE_STR[OrderType.MARKET],
+            "reduce_only": True,
+            "close_position": True
+        }
+
+        try:
+            response = await self._request("POST", "/v1/orders", body)
+        except CoinbaseAPIError as e:
+            if e.status not in (400, 422):
+                logger.error(f"Failed to close position for {product_id}: {e}")
+                raise
+            logger.info(f"Close-position order rejected for {product_id} ({e.status}), using two-step close")
+            self._close_orders_supported = False
+            return await self.close_position(product_id)
+
+        order_id = response.get("order_id")
+        if not order_id or response.get("success") is False:
+            # No order was created; close_position re-reads the position
+            logger.warning(f"Close-position order for {product_id} not accepted: {response}")
+            return await self.close_position(product_id)
+
+        filled_size = _safe_float(response.get("filled_size"))
+        size = _safe_float(response.get("size"), filled_size)
+        if size <= 0 and filled_size <= 0:
+            logger.warning(f"Close-position order {order_id} for {product_id} was not sized, using two-step close")
+            self._close_orders_supported = False
+            try:
+                await self.cancel_order(order_id)
+            except Exception as e:
+                logger.error(f"Failed to cancel unsized close order {order_id}: {e}")
+            return await self.close_position(product_id)
+
+        order = CoinbaseOrder(
+            order_id=order_id,
+            product_id=product_id,
+            side=_SIDE_FROM_STR.get(response.get("side")),
+            order_type=OrderType.MARKET,
+            size=size,
+            price=None,
+            status=_STATUS_FROM_STR.get(response.get("status"), OrderStatus.PENDING),
+            filled_size=filled_size,
+            average_filled_price=response.get("average_filled_price"),
+            created_time=response.get("created_time", ""),
+            updated_time=response.get("updated_time", "")
+        )
+
+        logger.info(f"Position closed: {product_id} ({order.size} units)")
+        return order
+
+    async def close_positions(self, product_ids: List[str]) -> Dict[str, Optional[CoinbaseOrder]]:
+        """
+        Close several margin positions concurrently.
+
+        Open positions are fetched once, then all closing orders are
+        placed in parallel (at most ORDER_CONCURRENCY in flight).
+
+        Args:
+            product_ids: Products to close
+
+        Returns:
+            Dict of product_id -> closing order, or None if there was no
+            position or its order failed
+        """
+        positions = {pos.product_id: pos for pos in await self.get_open_positions()}
+        orders: Dict[str, Optional[CoinbaseOrder]] = dict.fromkeys(product_ids)
+
+        matched = []
+        for product_id in product_ids:
+            if product_id in positions:
+                matched.append(positions[product_id])
+            else:
+                logger.warning(f"No position to close for {product_id}")
+
+        results = await asyncio.gather(
+            *(self._place_close(position) for position in matched),
+            return_exceptions=True
+        )
+
+        for position, result in zip(matched, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Failed to close position for {position.product_id}: {result}")
+            else:
+                orders[position.product_id] = result
+
+        return orders
+
+    async def _place_close(self, position: CoinbasePosition) -> CoinbaseOrder:
+        """
+        Place the market order that flattens a position.
+
+        Args:
+            position: Position to close
+
+        Returns:
+            Closing order
+        """
+        # Close with opposite side
+        side = _CLOSE_SIDE[position.size < 0]
+        size = abs(position.size)
+
+        async with self._order_semaphore:
             order = await self.place_order(
-                product_id=product_id,
+                product_id=position.product_id,
                 side=side,
                 order_type=OrderType.MARKET,
                 size=size
             )
 
-            logger.info(f"Position closed: {product_id} ({size} units)")
-            return order
-
-        except Exception as e:
-            logger.error(f"Failed to close position for {product_id}: {e}")
-            raise
+        logger.info(f"Position closed: {position.product_id} ({size} units)")
+        return order
 
     async def reduce_position(self,
                              product_id: str,
@@ -602,7 +1069,7 @@ class CoinbaseAPIClient:
                 reduction_amount = abs(position.size)
 
             # Reduce with opposite side
-            side = OrderSide.SELL if position.size > 0 else OrderSide.BUY
+            side = _CLOSE_SIDE[position.size < 0]
 
             order = await self.place_order(
                 product_id=product_id,
@@ -4,17 +4,180 @@ Enhanced with transactions, WAL mode, and connection pooling for production reli
 """
 
 import sqlite3
-from typing import List, Dict, Optional, Any
-from datetime import datetime
+from typing import List, Dict, Iterator, Optional, Any
+from datetime import datetime, timedelta
 from pathlib import Path
 import json
 import logging
 from contextlib import contextmanager
-from threading import Lock
+from threading import Event, RLock, Thread, local
 import os
+import re
+import sys
+import time
 
 logger = logging.getLogger(__name__)
 
+# PRAGMA synchronous levels accepted by TradingDatabase
+SYNCHRONOUS_MODES = frozenset({"OFF", "NORMAL", "FULL"})
+
+# Page cache and memory-mapped I/O (per connection). Only map on 64-bit
+# builds, where 256 MiB of address space is not a concern.
+CACHE_SIZE_KIB = 65536  # 64 MiB
+MMAP_SIZE = 256 * 1024 * 1024 if sys.maxsize > 2**32 else 0
+
+# STRICT tables (SQLite 3.37+) store values as declared instead of by type
+# affinity. Only applies to newly created tables. STRICT rejects values it
+# cannot convert losslessly, so columns fed caller-computed numbers (e.g.
+# trade duration) are REAL rather than INTEGER.
+_TABLE_OPTIONS = " STRICT" if sqlite3.sqlite_version_info >= (3, 37, 0) else ""
+
+# Tables whose row counts are kept in the counters table
+_COUNTED_TABLES = ("trades", "positions", "signals")
+
+# position_history partitions: column list shared by the hot table, the
+# monthly position_history_YYYYMM tables and the position_history_all view
+_POSITION_HISTORY_COLUMNS = "id, asset, event_type, old_values, new_values, timestamp"
+_MONTH_RE = re.compile(r"^\d{4}-\d{2}$")
+
+# Per-connection settings, each applied in a single executescript call.
+# NORMAL sync is safe with WAL; wal_autocheckpoint caps WAL growth (pages);
+# negative cache_size is in KiB; mmap lets reads use pages in place.
+_WRITER_PRAGMAS = f"""
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous={{synchronous}};
+    PRAGMA wal_autocheckpoint=1000;
+    PRAGMA cache_size=-{CACHE_SIZE_KIB};
+    PRAGMA temp_store=MEMORY;
+    PRAGMA mmap_size={MMAP_SIZE};
+    PRAGMA foreign_keys=ON;
+    PRAGMA busy_timeout=30000;
+"""
+_READER_PRAGMAS = f"""
+    PRAGMA query_only=1;
+    PRAGMA cache_size=-{CACHE_SIZE_KIB};
+    PRAGMA mmap_size={MMAP_SIZE};
+"""
+
+# Rows per fetchmany() batch when streaming results
+FETCH_BATCH_SIZE = 1000
+
+# Online backup: pages copied per step, and retry delay (seconds) when a step hits a lock
+BACKUP_PAGES_PER_STEP = 100
+BACKUP_STEP_SLEEP = 0.05
+
+# Files written by backup_database
+_BACKUP_NAME_RE = re.compile(r"^trading_data_backup_.*\.db$")
+
+# Seconds a PRAGMA integrity_check result is reused by get_database_stats
+INTEGRITY_CHECK_TTL = 3600
+
+# Background WAL checkpointing
+CHECKPOINT_INTERVAL = 30  # seconds
+WAL_TRUNCATE_BYTES = 16 * 1024 * 1024  # TRUNCATE instead of PASSIVE above this WAL size
+
+# Insert column order; parameter tuples are built with map(record.get, ...)
+_TRADE_FIELDS = (
+    'trade_id', 'asset', 'action', 'entry_price', 'exit_price', 'size', 'leverage',
+    'pnl', 'pnl_percent', 'duration_minutes', 'strategy', 'venue', 'status', 'timestamp'
+)
+_SIGNAL_FIELDS = ('strategy_name', 'action', 'confidence', 'asset', 'timestamp')
+_FUNDING_FIELDS = (
+    'trade_id', 'asset', 'funding_rate', 'position_size', 'income',
+    'duration_hours', 'annual_return_pct', 'timestamp'
+)
+
+# Hot-path statements, kept constant so they stay in the statement cache
+_SQL_INSERT_TRADE = """
+    INSERT INTO trades
+    (trade_id, asset, action, entry_price, exit_price, size, leverage,
+     pnl, pnl_percent, duration_minutes, strategy, venue, status, timestamp)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(trade_id) DO UPDATE SET
+        asset = excluded.asset,
+        action = excluded.action,
+        entry_price = excluded.entry_price,
+        exit_price = excluded.exit_price,
+        size = excluded.size,
+        leverage = excluded.leverage,
+        pnl = excluded.pnl,
+        pnl_percent = excluded.pnl_percent,
+        duration_minutes = excluded.duration_minutes,
+        strategy = excluded.strategy,
+        venue = excluded.venue,
+        status = excluded.status,
+        timestamp = excluded.timestamp
+"""
+
+_SQL_SELECT_RECENT_TRADES = """
+    SELECT * FROM trades
+    ORDER BY timestamp DESC
+    LIMIT ?
+"""
+
+_SQL_SELECT_RECENT_TRADE_SUMMARIES = """
+    SELECT timestamp, trade_id, asset, action, pnl, status FROM trades
+    ORDER BY timestamp DESC
+    LIMIT ?
+"""
+
+_SQL_DATABASE_STATS = """
+    SELECT
+        (SELECT n FROM counters WHERE table_name = 'trades'),
+        (SELECT n FROM counters WHERE table_name = 'positions'),
+        (SELECT n FROM counters WHERE table_name = 'signals'),
+        (SELECT page_count FROM pragma_page_count())
+"""
+
+_SQL_INSERT_SIGNAL = """
+    INSERT INTO signals (strategy_name, action, confidence, asset, timestamp)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+_SQL_SELECT_RECENT_SIGNALS = """
+    SELECT * FROM signals
+    ORDER BY timestamp DESC
+    LIMIT ?
+"""
+
+_SQL_INSERT_FUNDING = """
+    INSERT INTO funding_trades
+    (trade_id, asset, funding_rate, position_size, income, duration_hours, annual_return_pct, timestamp)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_FUNDING_STATS = """
+    SELECT COUNT(*),
+           COALESCE(SUM(income), 0.0),
+           COALESCE(AVG(income), 0.0),
+           COALESCE(MAX(funding_rate), 0.0),
+           COALESCE(MIN(funding_rate), 0.0)
+    FROM funding_trades
+"""
+
+_SQL_INSERT_METRIC = """
+    INSERT INTO metrics_snapshots
+    (portfolio_value, daily_pnl, portfolio_heat, win_rate, sharpe_ratio, max_drawdown_pct, timestamp)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_SELECT_METRICS_HISTORY = """
+    SELECT * FROM metrics_snapshots
+    WHERE created_at > ?
+    ORDER BY created_at DESC
+"""
+
+
+def _column_names(cursor: sqlite3.Cursor) -> tuple:
+    """Column names of the cursor's current result set"""
+    return tuple(column[0] for column in cursor.description)
+
+
+def _fetch_dicts(cursor: sqlite3.Cursor) -> List[Dict]:
+    """Fetch all remaining tuple rows as dicts, resolving column names once"""
+    keys = _column_names(cursor)
+    return [dict(zip(keys, row)) for row in cursor.fetchall()]
+
 
 class TradingDatabase:
     """
@@ -28,26 +191,62 @@ class TradingDatabase:
     - Integrity checks on startup
     """
 
-    def __init__(self, db_path: str = "logs/trading_data.db"):
+    def __init__(self, db_path: str = "logs/trading_data.db", synchronous: str = "NORMAL"):
         """
         Initialize database connection with production settings.
 
         Args:
             db_path: Path to SQLite database file
+            synchronous: PRAGMA synchronous level (OFF, NORMAL or FULL).
+                OFF skips fsync on commit: it survives a process crash but
+                a power loss or OS crash can corrupt the database.
         """
+        synchronous = synchronous.upper()
+        if synchronous not in SYNCHRONOUS_MODES:
+            raise ValueError(f"Invalid synchronous mode: {synchronous}")
+
         self.db_path = db_path
+        self.synchronous = synchronous
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
 
-        # Connection pooling settings
-        self._connection_lock = Lock()
+        # Connection pooling settings: one shared writer connection plus
+        # one read-only connection per thread (WAL lets readers run alongside
+        # the writer)
+        self._connection_lock = RLock()
         self._main_connection = None
+        self._local = local()
+        self._read_connections: List[sqlite3.Connection] = []
 
         # Initialize database with production settings
         self._init_db()
-        self._enable_wal_mode()
-        self._enable_foreign_keys()
+        self.rotate_position_history()
+        self._apply_pragmas()
         self._check_integrity()
 
+        # Fixed once the database exists
+        self._page_size = self._get_connection().execute("PRAGMA page_size").fetchone()[0]
+
+        # Checkpoint the WAL off the write path
+        self._stop_event = Event()
+        self._checkpoint_thread = Thread(
+            target=self._checkpoint_loop, name="db-wal-checkpoint", daemon=True
+        )
+        self._checkpoint_thread.start()
+
+    def close(self) -> None:
+        """Stop the checkpoint thread and close all connections"""
+        self._stop_event.set()
+        self._checkpoint_thread.join()
+
+        with self._connection_lock:
+            for conn in self._read_connections:
+                conn.close()
+            self._read_connections.clear()
+            if self._main_connection is not None:
+                self._main_connection.close()
+                self._main_connection = None
+        self._local = local()
+
     def _get_connection(self) -> sqlite3.Connection:
         """
         Get a database connection with proper settings.
@@ -56,15 +255,56 @@ class TradingDatabase:
         Returns:
             SQLite database connection
         """
-        if self._main_connection is None:
-            self._main_connection = sqlite3.connect(
+        with self._connection_lock:
+            if self._main_connection is None:
+                self._main_connection = sqlite3.connect(
+                    self.db_path,
+                    timeout=30.0,  # 30 second timeout
+                    cached_statements=256,  # Keep every hot query compiled
+                    check_same_thread=False,  # Allow use across threads
+                    isolation_level=None  # Manual transaction management for safety
+                )
+                self._main_connection.row_factory = sqlite3.Row
+        return self._main_connection
+
+    def _get_read_connection(self) -> sqlite3.Connection:
+        """
+        Get this thread's read-only connection, opening it on first use.
+        Pure SELECT paths use it so they don't queue behind the writer.
+
+        Returns:
+            SQLite database connection (query_only)
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
                 self.db_path,
-                timeout=30.0,  # 30 second timeout
-                check_same_thread=False,  # Allow use across threads
-                isolation_level=None  # Manual transaction management for safety
+                timeout=30.0,
+                cached_statements=256,
+                check_same_thread=False,  # Only used by this thread, but close() may run elsewhere
+                isolation_level=None
             )
-            self._main_connection.row_factory = sqlite3.Row
-        return self._main_connection
+            # Plain tuple rows; callers build dicts with _fetch_dicts()
+            conn.executescript(_READER_PRAGMAS)
+            self._local.conn = conn
+            with self._connection_lock:
+                self._read_connections.append(conn)
+        return conn
+
+    def _checkpoint_loop(self) -> None:
+        """Background thread: checkpoint the WAL every CHECKPOINT_INTERVAL seconds."""
+        conn = sqlite3.connect(self.db_path, timeout=30.0, isolation_level=None)
+        wal_file = Path(f"{self.db_path}-wal")
+        try:
+            while not self._stop_event.wait(CHECKPOINT_INTERVAL):
+                try:
+                    wal_size = wal_file.stat().st_size if wal_file.exists() else 0
+                    mode = "TRUNCATE" if wal_size > WAL_TRUNCATE_BYTES else "PASSIVE"
+                    conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone()
+                except Exception as e:
+                    logger.error(f"WAL checkpoint failed: {e}")
+        finally:
+            conn.close()
 
     @contextmanager
     def _transaction(self):
@@ -79,26 +319,32 @@ class TradingDatabase:
                 # Auto-commits on success, rolls back on error
         """
         conn = self._get_connection()
-        try:
-            conn.execute("BEGIN IMMEDIATE")  # Use IMMEDIATE for write safety
-            yield conn
-            conn.execute("COMMIT")
-            logger.debug("Transaction committed")
-        except Exception as e:
-            conn.execute("ROLLBACK")
-            logger.error(f"Transaction rolled back due to error: {e}")
-            raise
+        with self._connection_lock:
+            try:
+                conn.execute("BEGIN IMMEDIATE")  # Use IMMEDIATE for write safety
+                yield conn
+                conn.execute("COMMIT")
+                logger.debug("Transaction committed")
+            except Exception as e:
+                conn.execute("ROLLBACK")
+                logger.error(f"Transaction rolled back due to error: {e}")
+                raise
 
     def _init_db(self) -> None:
         """Initialize database tables with optimizations"""
         conn = self._get_connection()
         cursor = conn.cursor()
 
+        # Must precede the first CREATE TABLE; existing databases keep their mode
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        # Let REPLACE conflict deletions fire the row-count delete triggers
+        conn.execute("PRAGMA recursive_triggers=ON")
+
         try:
             conn.execute("BEGIN IMMEDIATE")
 
             # Trades table with indices
-            cursor.execute("""
+            cursor.execute(f"""
                 CREATE TABLE IF NOT EXISTS trades (
                     trade_id TEXT PRIMARY KEY,
                     asset TEXT NOT NULL,
@@ -109,19 +355,25 @@ class TradingDatabase:
                     leverage REAL NOT NULL,
                     pnl REAL,
                     pnl_percent REAL,
-                    duration_minutes INTEGER,
+                    duration_minutes REAL,
                     strategy TEXT,
                     venue TEXT,
                     status TEXT,
                     timestamp TEXT,
                     created_at TEXT DEFAULT CURRENT_TIMESTAMP
-                )
+                ){_TABLE_OPTIONS}
             """)
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_trades_timestamp ON trades(timestamp DESC)")
+            # Covers the recent-trade summary columns; also serves plain
+            # timestamp ordering, so the old single-column index is dropped
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_trades_timestamp_cover
+                ON trades(timestamp DESC, trade_id, asset, action, pnl, status)
+            """)
+            cursor.execute("DROP INDEX IF EXISTS idx_trades_timestamp")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_trades_asset ON trades(asset)")
 
             # Positions table
-            cursor.execute("""
+            cursor.execute(f"""
                 CREATE TABLE IF NOT EXISTS positions (
                     asset TEXT PRIMARY KEY,
                     entry_price REAL NOT NULL,
@@ -133,25 +385,42 @@ class TradingDatabase:
                     opened_at TEXT NOT NULL,
                     updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
                     last_reconciled_at TEXT
-                )
+                ){_TABLE_OPTIONS}
             """)
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_positions_updated ON positions(updated_at DESC)")
 
-            # Position history for audit trail
-            cursor.execute("""
+            # Position history for audit trail. This is the current month's
+            # partition; rotate_position_history() moves older months out.
+            # Older databases declared a foreign key on asset, which costs a
+            # lookup per insert and blocks deleting closed positions: rebuild
+            # those without it.
+            legacy_history = cursor.execute(
+                "SELECT 1 FROM pragma_foreign_key_list('position_history')"
+            ).fetchone()
+            if legacy_history:
+                cursor.execute("DROP VIEW IF EXISTS position_history_all")
+                cursor.execute("ALTER TABLE position_history RENAME TO position_history_legacy")
+
+            cursor.execute(f"""
                 CREATE TABLE IF NOT EXISTS position_history (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     asset TEXT NOT NULL,
                     event_type TEXT NOT NULL,
                     old_values TEXT,
                     new_values TEXT,
-                    timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (asset) REFERENCES positions(asset)
-                )
+                    timestamp TEXT DEFAULT CURRENT_TIMESTAMP
+                ){_TABLE_OPTIONS}
             """)
 
+            if legacy_history:
+                cursor.execute(f"""
+                    INSERT INTO position_history ({_POSITION_HISTORY_COLUMNS})
+                    SELECT {_POSITION_HISTORY_COLUMNS} FROM position_history_legacy
+                """)
+                cursor.execute("DROP TABLE position_history_legacy")
+
             # Signals table
-            cursor.execute("""
+            cursor.execute(f"""
                 CREATE TABLE IF NOT EXISTS signals (
                     signal_id INTEGER PRIMARY KEY AUTOINCREMENT,
                     strategy_name TEXT NOT NULL,
@@ -160,12 +429,12 @@ class TradingDatabase:
                     asset TEXT NOT NULL,
                     timestamp TEXT NOT NULL,
                     created_at TEXT DEFAULT CURRENT_TIMESTAMP
-                )
+                ){_TABLE_OPTIONS}
             """)
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_signals_timestamp ON signals(timestamp DESC)")
 
             # Funding trades table
-            cursor.execute("""
+            cursor.execute(f"""
                 CREATE TABLE IF NOT EXISTS funding_trades (
                     trade_id TEXT PRIMARY KEY,
                     asset TEXT NOT NULL,
@@ -176,11 +445,11 @@ class TradingDatabase:
                     annual_return_pct REAL,
                     timestamp TEXT NOT NULL,
                     created_at TEXT DEFAULT CURRENT_TIMESTAMP
-                )
+                ){_TABLE_OPTIONS}
             """)
 
             # Metrics snapshots table
-            cursor.execute("""
+            cursor.execute(f"""
                 CREATE TABLE IF NOT EXISTS metrics_snapshots (
                     snapshot_id INTEGER PRIMARY KEY AUTOINCREMENT,
                     portfolio_value REAL NOT NULL,
@@ -191,11 +460,12 @@ class TradingDatabase:
                     max_drawdown_pct REAL,
                     timestamp TEXT NOT NULL,
                     created_at TEXT DEFAULT CURRENT_TIMESTAMP
-                )
+                ){_TABLE_OPTIONS}
             """)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_metrics_created ON metrics_snapshots(created_at DESC)")
 
             # Backup metadata table
-            cursor.execute("""
+            cursor.execute(f"""
                 CREATE TABLE IF NOT EXISTS backup_metadata (
                     backup_id INTEGER PRIMARY KEY AUTOINCREMENT,
                     backup_path TEXT UNIQUE NOT NULL,
@@ -205,39 +475,57 @@ class TradingDatabase:
                     size_bytes INTEGER,
                     verified INTEGER DEFAULT 0,
                     created_at TEXT DEFAULT CURRENT_TIMESTAMP
-                )
+                ){_TABLE_OPTIONS}
             """)
 
+            # Row counts maintained by triggers, so stats don't need COUNT(*) scans
+            cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS counters (
+                    table_name TEXT PRIMARY KEY,
+                    n INTEGER NOT NULL
+                ){_TABLE_OPTIONS}
+            """)
+            for table in _COUNTED_TABLES:
+                # Seeds the counter once for databases created before the triggers
+                cursor.execute(f"""
+                    INSERT OR IGNORE INTO counters (table_name, n)
+                    SELECT '{table}', COUNT(*) FROM {table}
+                """)
+                cursor.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS {table}_count_ins AFTER INSERT ON {table}
+                    BEGIN
+                        UPDATE counters SET n = n + 1 WHERE table_name = '{table}';
+                    END
+                """)
+                cursor.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS {table}_count_del AFTER DELETE ON {table}
+                    BEGIN
+                        UPDATE counters SET n = n - 1 WHERE table_name = '{table}';
+                    END
+                """)
+
             conn.execute("COMMIT")
+
+            # Refresh planner statistics where they are stale
+            conn.execute("PRAGMA optimize")
             logger.info(f"Database initialized at {self.db_path}")
         except Exception as e:
             conn.execute("ROLLBACK")
             logger.error(f"Failed to initialize database: {e}")
             raise
 
-    def _enable_wal_mode(self) -> None:
+    def _apply_pragmas(self) -> None:
         """
-        Enable Write-Ahead Logging (WAL) mode for better concurrency.
-        Allows readers and writers to operate simultaneously.
+        Configure the writer connection in one executescript round-trip:
+        WAL mode (readers and writers operate simultaneously), sync level,
+        cache and mmap sizes, and foreign key constraints.
         """
         try:
             conn = self._get_connection()
-            conn.execute("PRAGMA journal_mode=WAL")
-            conn.execute("PRAGMA synchronous=NORMAL")  # Faster than FULL, still safe
-            conn.execute("PRAGMA cache_size=10000")  # Larger cache
-            conn.execute("PRAGMA temp_store=MEMORY")  # Use memory for temp
-            logger.info("WAL mode enabled for better concurrency")
+            conn.executescript(_WRITER_PRAGMAS.format(synchronous=self.synchronous))
+            logger.info("WAL mode and foreign key constraints enabled")
         except Exception as e:
-            logger.error(f"Failed to enable WAL mode: {e}")
-
-    def _enable_foreign_keys(self) -> None:
-        """Enable foreign key constraints for data integrity"""
-        try:
-            conn = self._get_connection()
-            conn.execute("PRAGMA foreign_keys=ON")
-            logger.info("Foreign key constraints enabled")
-        except Exception as e:
-            logger.error(f"Failed to enable foreign keys: {e}")
+            logger.error(f"Failed to apply database pragmas: {e}")
 
     def _check_integrity(self) -> bool:
         """
@@ -254,13 +542,32 @@ class TradingDatabase:
 
             if result == "ok":
                 logger.info("Database integrity check passed")
-                return True
+                ok = True
             else:
                 logger.error(f"Database integrity check failed: {result}")
-                return False
+                ok = False
         except Exception as e:
             logger.error(f"Failed to check database integrity: {e}")
-            return False
+            ok = False
+
+        self._last_integrity_ok = ok
+        self._last_integrity_check_ts = time.monotonic()
+        return ok
+
+    def verify_integrity(self) -> bool:
+        """
+        Run a full integrity check now (reads every page).
+
+        Returns:
+            True if integrity check passes, False otherwise
+        """
+        return self._check_integrity()
+
+    def _cached_integrity_ok(self) -> bool:
+        """Last integrity result, re-checked once older than INTEGRITY_CHECK_TTL"""
+        if time.monotonic() - self._last_integrity_check_ts > INTEGRITY_CHECK_TTL:
+            return self._check_integrity()
+        return self._last_integrity_ok
 
     def add_trade(self, trade_data: Dict) -> None:
         """
@@ -269,33 +576,26 @@ class TradingDatabase:
         Args:
             trade_data: Trade information dictionary
         """
+        self.add_trades_bulk([trade_data])
+
+    def add_trades_bulk(self, trades: List[Dict]) -> None:
+        """
+        Add many trades in a single transaction.
+
+        Args:
+            trades: List of trade information dictionaries
+        """
+        rows = [tuple(map(t.get, _TRADE_FIELDS)) for t in trades]
+
         try:
             with self._transaction() as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT OR REPLACE INTO trades
-                    (trade_id, asset, action, entry_price, exit_price, size, leverage,
-                     pnl, pnl_percent, duration_minutes, strategy, venue, status, timestamp)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    trade_data.get('trade_id'),
-                    trade_data.get('asset'),
-                    trade_data.get('action'),
-                    trade_data.get('entry_price'),
-                    trade_data.get('exit_price'),
-                    trade_data.get('size'),
-                    trade_data.get('leverage'),
-                    trade_data.get('pnl'),
-                    trade_data.get('pnl_percent'),
-                    trade_data.get('duration_minutes'),
-                    trade_data.get('strategy'),
-                    trade_data.get('venue'),
-                    trade_data.get('status'),
-                    trade_data.get('timestamp')
-                ))
-                logger.info(f"Trade {trade_data.get('trade_id')} recorded in database")
+                conn.executemany(_SQL_INSERT_TRADE, rows)
+            if len(rows) == 1:
+                logger.info(f"Trade {rows[0][0]} recorded in database")
+            else:
+                logger.info(f"{len(rows)} trades recorded in database")
         except Exception as e:
-            logger.error(f"Failed to add trade: {e}")
+            logger.error(f"Failed to add trades: {e}")
             raise
 
     def get_recent_trades(self, limit: int = 100) -> List[Dict]:
@@ -309,19 +609,55 @@ class TradingDatabase:
             List of trade records
         """
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT * FROM trades
-                ORDER BY timestamp DESC
-                LIMIT ?
-            """, (limit,))
-            trades = [dict(row) for row in cursor.fetchall()]
-            return trades
+            return list(self.iter_recent_trades(limit))
         except Exception as e:
             logger.error(f"Failed to retrieve trades: {e}")
             return []
 
+    def iter_recent_trades(self, limit: int = 100) -> Iterator[Dict]:
+        """
+        Stream recent trades without materializing the whole result.
+
+        Rows are fetched in batches of FETCH_BATCH_SIZE; errors propagate
+        to the caller.
+
+        Args:
+            limit: Maximum number of trades to yield
+
+        Yields:
+            Trade records, newest first
+        """
+        conn = self._get_read_connection()
+        cursor = conn.cursor()
+        cursor.arraysize = FETCH_BATCH_SIZE
+        cursor.execute(_SQL_SELECT_RECENT_TRADES, (limit,))
+        keys = _column_names(cursor)
+        while rows := cursor.fetchmany():
+            for row in rows:
+                yield dict(zip(keys, row))
+
+    def get_recent_trade_summaries(self, limit: int = 100) -> List[Dict]:
+        """
+        Get recent trades with only the summary columns.
+
+        Served entirely from idx_trades_timestamp_cover, without touching
+        the table itself.
+
+        Args:
+            limit: Maximum number of trades to return
+
+        Returns:
+            List of dicts with timestamp, trade_id, asset, action, pnl and status
+        """
+        try:
+            conn = self._get_read_connection()
+            cursor = conn.cursor()
+            cursor.execute(_SQL_SELECT_RECENT_TRADE_SUMMARIES, (limit,))
+            return _fetch_dicts(cursor)
+        except Exception as e:
+            logger.error(f"Failed to retrieve trade summaries: {e}")
+            return []
+
     def add_signal(self, strategy_name: str, action: str, confidence: float,
                    asset: str, timestamp: str) -> None:
         """
@@ -334,16 +670,26 @@ class TradingDatabase:
             asset: Trading asset
             timestamp: Signal timestamp
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        self.add_signals_bulk([{
+            'strategy_name': strategy_name,
+            'action': action,
+            'confidence': confidence,
+            'asset': asset,
+            'timestamp': timestamp
+        }])
+
+    def add_signals_bulk(self, signals: List[Dict]) -> None:
+        """
+        Record many strategy signals in a single transaction.
 
-        cursor.execute("""
-            INSERT INTO signals (strategy_name, action, confidence, asset, timestamp)
-            VALUES (?, ?, ?, ?, ?)
-        """, (strategy_name, action, confidence, asset, timestamp))
+        Args:
+            signals: List of dicts with strategy_name, action, confidence,
+                asset and timestamp
+        """
+        rows = [tuple(map(s.get, _SIGNAL_FIELDS)) for s in signals]
 
-        conn.commit()
-        conn.close()
+        with self._transaction() as conn:
+            conn.executemany(_SQL_INSERT_SIGNAL, rows)
 
     def get_recent_signals(self, limit: int = 50) -> List[Dict]:
         """
@@ -355,19 +701,12 @@ class TradingDatabase:
         Returns:
             List of signals
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        conn = self._get_read_connection()
         cursor = conn.cursor()
 
-        cursor.execute("""
-            SELECT * FROM signals
-            ORDER BY timestamp DESC
-            LIMIT ?
-        """, (limit,))
+        cursor.execute(_SQL_SELECT_RECENT_SIGNALS, (limit,))
 
-        signals = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-        return signals
+        return _fetch_dicts(cursor)
 
     def add_funding_trade(self, trade_data: Dict) -> None:
         """
@@ -376,26 +715,19 @@ class TradingDatabase:
         Args:
             trade_data: Funding trade information
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        self.add_funding_trades_bulk([trade_data])
 
-        cursor.execute("""
-            INSERT INTO funding_trades
-            (trade_id, asset, funding_rate, position_size, income, duration_hours, annual_return_pct, timestamp)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            trade_data.get('trade_id'),
-            trade_data.get('asset'),
-            trade_data.get('funding_rate'),
-            trade_data.get('position_size'),
-            trade_data.get('income'),
-            trade_data.get('duration_hours'),
-            trade_data.get('annual_return_pct'),
-            trade_data.get('timestamp')
-        ))
-
-        conn.commit()
-        conn.close()
+    def add_funding_trades_bulk(self, trades: List[Dict]) -> None:
+        """
+        Record many funding arbitrage trades in a single transaction.
+
+        Args:
+            trades: List of funding trade information dictionaries
+        """
+        rows = [tuple(map(t.get, _FUNDING_FIELDS)) for t in trades]
+
+        with self._transaction() as conn:
+            conn.executemany(_SQL_INSERT_FUNDING, rows)
 
     def get_funding_stats(self) -> Dict:
         """
@@ -404,25 +736,11 @@ class TradingDatabase:
         Returns:
             Funding statistics
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_read_connection()
         cursor = conn.cursor()
 
-        cursor.execute("SELECT COUNT(*) as total FROM funding_trades")
-        total = cursor.fetchone()[0]
-
-        cursor.execute("SELECT SUM(income) as total_income FROM funding_trades")
-        total_income = cursor.fetchone()[0] or 0.0
-
-        cursor.execute("SELECT AVG(income) as avg_income FROM funding_trades")
-        avg_income = cursor.fetchone()[0] or 0.0
-
-        cursor.execute("SELECT MAX(funding_rate) as best_rate FROM funding_trades")
-        best_rate = cursor.fetchone()[0] or 0.0
-
-        cursor.execute("SELECT MIN(funding_rate) as worst_rate FROM funding_trades")
-        worst_rate = cursor.fetchone()[0] or 0.0
-
-        conn.close()
+        cursor.execute(_SQL_FUNDING_STATS)
+        total, total_income, avg_income, best_rate, worst_rate = cursor.fetchone()
 
         return {
             'total_trades': total,
@@ -439,25 +757,16 @@ class TradingDatabase:
         Args:
             metrics: Metrics dictionary
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            INSERT INTO metrics_snapshots
-            (portfolio_value, daily_pnl, portfolio_heat, win_rate, sharpe_ratio, max_drawdown_pct, timestamp)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (
-            metrics.get('portfolio_value'),
-            metrics.get('daily_pnl'),
-            metrics.get('portfolio_heat'),
-            metrics.get('win_rate'),
-            metrics.get('sharpe_ratio'),
-            metrics.get('max_drawdown_pct'),
-            datetime.now().isoformat()
-        ))
-
-        conn.commit()
-        conn.close()
+        with self._transaction() as conn:
+            conn.execute(_SQL_INSERT_METRIC, (
+                metrics.get('portfolio_value'),
+                metrics.get('daily_pnl'),
+                metrics.get('portfolio_heat'),
+                metrics.get('win_rate'),
+                metrics.get('sharpe_ratio'),
+                metrics.get('max_drawdown_pct'),
+                datetime.now().isoformat()
+            ))
 
     def get_metrics_history(self, hours: int = 24) -> List[Dict]:
         """
@@ -469,19 +778,14 @@ class TradingDatabase:
         Returns:
             List of metrics snapshots
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        conn = self._get_read_connection()
         cursor = conn.cursor()
 
-        cursor.execute("""
-            SELECT * FROM metrics_snapshots
-            WHERE datetime(created_at) > datetime('now', ? || ' hours')
-            ORDER BY created_at DESC
-        """, (f'-{hours}',))
+        # Same format as CURRENT_TIMESTAMP (UTC) so the comparison can use the index
+        cutoff = (datetime.utcnow() - timedelta(hours=hours)).strftime("%Y-%m-%d %H:%M:%S")
+        cursor.execute(_SQL_SELECT_METRICS_HISTORY, (cutoff,))
 
-        snapshots = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-        return snapshots
+        return _fetch_dicts(cursor)
 
     def backup_database(self, backup_dir: str = "backups") -> Optional[str]:
         """
@@ -500,23 +804,34 @@ class TradingDatabase:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             backup_file = backup_path / f"trading_data_backup_{timestamp}.db"
 
-            # Create backup using SQLite backup API
-            conn = self._get_connection()
-            backup_conn = sqlite3.connect(str(backup_file))
-
-            with backup_conn:
-                conn.backup(backup_conn)
+            # Create backup using SQLite backup API, from the read connection so
+            # the writer stays free. Holding a read transaction pins one WAL
+            # snapshot: the copy (and the counts) stay consistent, and writes
+            # in between batches don't force the backup to restart.
+            conn = self._get_read_connection()
+            backup_conn = sqlite3.connect(str(backup_file), isolation_level=None)
+
+            try:
+                # Outside the inner try: if BEGIN fails there is nothing to
+                # commit, and a COMMIT would mask the original error
+                conn.execute("BEGIN")
+                try:
+                    cursor = conn.cursor()
+                    cursor.execute("SELECT COUNT(*) FROM trades")
+                    trades_count = cursor.fetchone()[0]
+                    cursor.execute("SELECT COUNT(*) FROM positions")
+                    positions_count = cursor.fetchone()[0]
+
+                    # Copy in batches so other connections aren't locked out
+                    conn.backup(backup_conn, pages=BACKUP_PAGES_PER_STEP, sleep=BACKUP_STEP_SLEEP)
+                finally:
+                    conn.execute("COMMIT")
+            finally:
+                backup_conn.close()
 
             # Get file size
             file_size = backup_file.stat().st_size
 
-            # Get record counts
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM trades")
-            trades_count = cursor.fetchone()[0]
-            cursor.execute("SELECT COUNT(*) FROM positions")
-            positions_count = cursor.fetchone()[0]
-
             # Record backup metadata
             with self._transaction() as db_conn:
                 db_cursor = db_conn.cursor()
@@ -580,15 +895,14 @@ class TradingDatabase:
             List of backup metadata records
         """
         try:
-            conn = self._get_connection()
+            conn = self._get_read_connection()
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT * FROM backup_metadata
                 ORDER BY backup_time DESC
                 LIMIT ?
             """, (limit,))
-            backups = [dict(row) for row in cursor.fetchall()]
-            return backups
+            return _fetch_dicts(cursor)
         except Exception as e:
             logger.error(f"Failed to get backup history: {e}")
             return []
@@ -604,20 +918,26 @@ class TradingDatabase:
         Returns:
             Number of backups deleted
         """
+        # Off-peak maintenance: archive last month's position history and
+        # return free pages to the filesystem
+        self.rotate_position_history()
+        self.vacuum_incremental()
+
         try:
-            from datetime import timedelta
-            cutoff_date = datetime.now() - timedelta(days=days)
-            backup_path = Path(backup_dir)
+            cutoff_ts = (datetime.now() - timedelta(days=days)).timestamp()
             deleted_count = 0
 
-            if not backup_path.exists():
+            if not os.path.isdir(backup_dir):
                 return 0
 
-            for backup_file in backup_path.glob("trading_data_backup_*.db"):
-                if backup_file.stat().st_mtime < cutoff_date.timestamp():
-                    backup_file.unlink()
-                    deleted_count += 1
-                    logger.info(f"Deleted old backup: {backup_file}")
+            with os.scandir(backup_dir) as entries:
+                for entry in entries:
+                    if not _BACKUP_NAME_RE.match(entry.name):
+                        continue
+                    if entry.stat(follow_symlinks=False).st_mtime < cutoff_ts:
+                        os.unlink(entry.path)
+                        deleted_count += 1
+                        logger.info(f"Deleted old backup: {entry.path}")
 
             logger.info(f"Cleanup complete: {deleted_count} old backups removed")
             return deleted_count
@@ -626,6 +946,93 @@ class TradingDatabase:
             logger.error(f"Failed to cleanup old backups: {e}")
             return 0
 
+    def rotate_position_history(self) -> int:
+        """
+        Move position history from previous months into monthly partitions.
+
+        Rows are moved into position_history_YYYYMM tables, keeping the
+        position_history table (where all writes go) down to the current
+        month. The position_history_all view is rebuilt to UNION ALL every
+        partition for readers that need the full audit trail.
+
+        Returns:
+            Number of rows moved, or -1 on failure
+        """
+        current_month = datetime.utcnow().strftime("%Y-%m")
+        moved = 0
+
+        try:
+            with self._transaction() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT DISTINCT substr(timestamp, 1, 7) FROM position_history
+                    WHERE substr(timestamp, 1, 7) < ?
+                """, (current_month,))
+                months = [row[0] for row in cursor.fetchall() if _MONTH_RE.match(row[0])]
+
+                for month in months:
+                    partition = f"position_history_{month.replace('-', '')}"
+                    cursor.execute(f"""
+                        CREATE TABLE IF NOT EXISTS {partition} (
+                            id INTEGER PRIMARY KEY,
+                            asset TEXT NOT NULL,
+                            event_type TEXT NOT NULL,
+                            old_values TEXT,
+                            new_values TEXT,
+                            timestamp TEXT
+                        ){_TABLE_OPTIONS}
+                    """)
+                    cursor.execute(f"""
+                        INSERT INTO {partition} ({_POSITION_HISTORY_COLUMNS})
+                        SELECT {_POSITION_HISTORY_COLUMNS} FROM position_history
+                        WHERE substr(timestamp, 1, 7) = ?
+                    """, (month,))
+                    cursor.execute(
+                        "DELETE FROM position_history WHERE substr(timestamp, 1, 7) = ?", (month,)
+                    )
+                    moved += cursor.rowcount
+
+                cursor.execute("""
+                    SELECT name FROM sqlite_master
+                    WHERE type = 'table' AND name GLOB 'position_history_[0-9]*'
+                    ORDER BY name
+                """)
+                partitions = [row[0] for row in cursor.fetchall()] + ["position_history"]
+                cursor.execute("DROP VIEW IF EXISTS position_history_all")
+                cursor.execute("CREATE VIEW position_history_all AS " + " UNION ALL ".join(
+                    f"SELECT {_POSITION_HISTORY_COLUMNS} FROM {name}" for name in partitions
+                ))
+
+            if moved:
+                logger.info(f"Archived {moved} position history rows into {len(months)} monthly partitions")
+            return moved
+        except Exception as e:
+            logger.error(f"Failed to rotate position history: {e}")
+            return -1
+
+    def vacuum_incremental(self, pages: int = 1000) -> int:
+        """
+        Release free pages back to the filesystem (auto_vacuum=INCREMENTAL).
+
+        Args:
+            pages: Maximum number of free pages to release
+
+        Returns:
+            Number of free pages left afterwards, or -1 on failure
+        """
+        try:
+            conn = self._get_connection()
+            with self._connection_lock:
+                # executescript steps the pragma to completion; execute() would
+                # stop after freeing a single page
+                conn.executescript(f"PRAGMA incremental_vacuum({int(pages)})")
+                freelist = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            logger.debug(f"Incremental vacuum done, {freelist} free pages left")
+            return freelist
+        except Exception as e:
+            logger.error(f"Failed to run incremental vacuum: {e}")
+            return -1
+
     def get_database_stats(self) -> Dict[str, Any]:
         """
         Get database statistics and health information.
@@ -634,18 +1041,12 @@ class TradingDatabase:
             Dictionary with database stats
         """
         try:
-            conn = self._get_connection()
+            conn = self._get_read_connection()
             cursor = conn.cursor()
 
-            # Get record counts
-            cursor.execute("SELECT COUNT(*) FROM trades")
-            trades_count = cursor.fetchone()[0]
-
-            cursor.execute("SELECT COUNT(*) FROM positions")
-            positions_count = cursor.fetchone()[0]
-
-            cursor.execute("SELECT COUNT(*) FROM signals")
-            signals_count = cursor.fetchone()[0]
+            # Record counts and page count in one round-trip
+            cursor.execute(_SQL_DATABASE_STATS)
+            trades_count, positions_count, signals_count, page_count = cursor.fetchone()
 
             # Get database file size
             db_file_size = Path(self.db_path).stat().st_size
@@ -654,13 +1055,7 @@ class TradingDatabase:
             wal_file = Path(f"{self.db_path}-wal")
             wal_size = wal_file.stat().st_size if wal_file.exists() else 0
 
-            # Get page count
-            cursor.execute("PRAGMA page_count")
-            page_count = cursor.fetchone()[0]
-
-            # Get page size
-            cursor.execute("PRAGMA page_size")
-            page_size = cursor.fetchone()[0]
+            page_size = self._page_size
 
             return {
                 "trades_count": trades_count,
@@ -672,7 +1067,7 @@ class TradingDatabase:
                 "page_count": page_count,
                 "page_size": page_size,
                 "total_pages_bytes": page_count * page_size,
-                "integrity_ok": self._check_integrity()
+                "integrity_ok": self._cached_integrity_ok()
             }
         except Exception as e:
             logger.error(f"Failed to get database stats: {e}")
@@ -11,23 +11,44 @@ Provides a unified interface for:
 
 import asyncio
 import logging
+import time
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from enum import Enum
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
+from operator import attrgetter
 
 from hyperliquid_api import (
-    HyperliquidAPIClient, HyperliquidPosition, HyperliquidOrder,
+    HyperliquidAPIClient, HyperliquidPosition, HyperliquidOrder, HyperliquidBalance,
     OrderType as HLOrderType, OrderSide, OrderStatus
 )
 from coinbase_api import (
-    CoinbaseAPIClient, CoinbasePosition, CoinbaseOrder,
+    CoinbaseAPIClient, CoinbasePosition, CoinbaseOrder, CoinbaseBalance,
     OrderType as CBOrderType, OrderSide as CBOrderSide
 )
 from position_manager import PositionManager, Position, PositionStatus
 
 logger = logging.getLogger(__name__)
 
+# Seconds get_all_positions reuses a fetched snapshot
+POSITIONS_CACHE_TTL = 2.0
+
+# Oldest snapshot (seconds) get_all_positions falls back to when a refresh fails
+POSITIONS_MAX_STALE_AGE = 5 * POSITIONS_CACHE_TTL
+
+# Seconds get_prices reuses a market price snapshot
+PRICES_CACHE_TTL = 1.0
+
+# Max in-flight orders per exchange for place_orders (rate limits)
+HL_ORDER_CONCURRENCY = 8
+CB_ORDER_CONCURRENCY = 4
+
+# Seconds between background refreshes of the auto-selected order exchange
+ALLOCATION_REFRESH_INTERVAL = 2.0
+
+# Background refreshes stop this many seconds after the last order
+ALLOCATION_IDLE_TIMEOUT = 60.0
+
 
 class ExchangeType(Enum):
     """Supported exchanges"""
@@ -35,7 +56,13 @@ class ExchangeType(Enum):
     COINBASE = "coinbase"
 
 
-@dataclass
+# Lookup tables for exchange names (as in get_position) and order sides
+_EXCHANGE_STR = {"hyperliquid": ExchangeType.HYPERLIQUID, "coinbase": ExchangeType.COINBASE}
+_HL_SIDE = {"BUY": OrderSide.BUY, "SELL": OrderSide.SELL}
+_CB_SIDE = {"BUY": CBOrderSide.BUY, "SELL": CBOrderSide.SELL}
+
+
+@dataclass(slots=True, frozen=True)
 class ExecutionResult:
     """Result of trade execution"""
     success: bool
@@ -49,6 +76,105 @@ class ExecutionResult:
     timestamp: str
 
 
+# (epoch second, ISO string) of the last _now_iso() call
+_last_iso_ts: Tuple[int, str] = (0, "")
+
+
+def _now_iso() -> str:
+    """
+    Current UTC time as an ISO string, at one-second resolution.
+
+    The string is built once per second and reused by every result and
+    status dict created within that second.
+    """
+    global _last_iso_ts
+    now = time.time_ns() // 1_000_000_000
+    if now != _last_iso_ts[0]:
+        _last_iso_ts = (now, datetime.utcfromtimestamp(now).isoformat())
+    return _last_iso_ts[1]
+
+
+@dataclass(slots=True, frozen=True)
+class OrderSpec:
+    """One order for UnifiedExchangeClient.place_orders"""
+    asset: str
+    side: str
+    size: float
+    exchange: Optional[ExchangeType] = None
+    price: Optional[float] = None
+    leverage: float = 1.0
+
+
+_FAILED_STATUS = "FAILED"
+_NOT_FOUND_STATUS = "NOT_FOUND"
+
+
+def _ok_result(exchange: ExchangeType, asset: str, order, size: float,
+               price: Optional[float], message: str) -> ExecutionResult:
+    """Build the ExecutionResult for an accepted order"""
+    return ExecutionResult(
+        success=True,
+        exchange=exchange,
+        asset=asset,
+        order_id=order.order_id,
+        size=size,
+        price=price,
+        status=order.status.value,
+        message=message,
+        timestamp=_now_iso()
+    )
+
+
+def _fail_result(exchange: ExchangeType, asset: str, size: float, price: Optional[float],
+                 message: str, status: str = _FAILED_STATUS) -> ExecutionResult:
+    """Build the ExecutionResult for an order that was not placed"""
+    return ExecutionResult(
+        success=False,
+        exchange=exchange,
+        asset=asset,
+        order_id="",
+        size=size,
+        price=price,
+        status=status,
+        message=message,
+        timestamp=_now_iso()
+    )
+
+
+def _dict_packer(cls):
+    """
+    Build a fast dataclass-to-dict function for flat dataclasses.
+
+    Field names are resolved once; each call is a single attrgetter plus
+    zip, instead of asdict's per-field recursion and deep copy.
+    """
+    names = tuple(f.name for f in fields(cls))
+    get = attrgetter(*names)
+    return lambda obj: dict(zip(names, get(obj)))
+
+
+_pack_hl_position = _dict_packer(HyperliquidPosition)
+_pack_cb_position = _dict_packer(CoinbasePosition)
+_pack_hl_balance = _dict_packer(HyperliquidBalance)
+_pack_cb_balance = _dict_packer(CoinbaseBalance)
+
+
+def _compute_notionals(positions: Dict[str, List]) -> Tuple[float, float]:
+    """
+    Sum absolute notional value per exchange.
+
+    Args:
+        positions: get_all_positions() result
+
+    Returns:
+        (hyperliquid_notional, coinbase_notional)
+    """
+    return (
+        sum(abs(p["size"] * p["current_price"]) for p in positions["hyperliquid"]),
+        sum(abs(p["size"] * p["current_price"]) for p in positions["coinbase"])
+    )
+
+
 class UnifiedExchangeClient:
     """
     Unified interface for multiple exchanges.
@@ -89,13 +215,37 @@ class UnifiedExchangeClient:
 
         # Session management
         self._session = None
+
+        # Last get_all_positions snapshot; kept past its TTL as a fallback
+        # while an exchange is unreachable
+        self._positions_cache: Optional[Dict] = None
+        self._positions_cache_ts = 0.0
+        self._positions_invalidated = False
+        self._positions_notionals: Tuple[float, float] = (0.0, 0.0)
+
+        # Last market price snapshot and the in-flight refresh, if any
+        self._prices_cache: Optional[Dict[str, float]] = None
+        self._prices_cache_ts = 0.0
+        self._prices_request: Optional[asyncio.Future] = None
+
+        # Per-exchange caps for batched order dispatch
+        self._order_semaphores = {
+            ExchangeType.HYPERLIQUID: asyncio.Semaphore(HL_ORDER_CONCURRENCY),
+            ExchangeType.COINBASE: asyncio.Semaphore(CB_ORDER_CONCURRENCY),
+        }
+
+        # Exchange for auto-routed orders, kept fresh by _allocation_loop
+        self._cached_allocation: Optional[ExchangeType] = None
+        self._allocation_task: Optional[asyncio.Task] = None
+        self._last_order_ts = 0.0
         logger.info("Unified exchange client initialized")
 
     async def connect(self) -> None:
         """Connect to both exchanges"""
         try:
-            await self.hl_client.connect()
-            await self.cb_client.connect()
+            await asyncio.gather(self.hl_client.connect(), self.cb_client.connect())
+            if self._allocation_task is None:
+                self._allocation_task = asyncio.create_task(self._allocation_loop())
             logger.info("Connected to all exchanges")
         except Exception as e:
             logger.error(f"Failed to connect to exchanges: {e}")
@@ -103,12 +253,23 @@ class UnifiedExchangeClient:
 
     async def disconnect(self) -> None:
         """Disconnect from both exchanges"""
-        try:
-            await self.hl_client.disconnect()
-            await self.cb_client.disconnect()
+        if self._allocation_task is not None:
+            self._allocation_task.cancel()
+            self._allocation_task = None
+            self._cached_allocation = None
+
+        # Disconnect both even if one fails
+        results = await asyncio.gather(
+            self.hl_client.disconnect(),
+            self.cb_client.disconnect(),
+            return_exceptions=True
+        )
+        errors = [r for r in results if isinstance(r, Exception)]
+        if errors:
+            for e in errors:
+                logger.error(f"Failed to disconnect: {e}")
+        else:
             logger.info("Disconnected from all exchanges")
-        except Exception as e:
-            logger.error(f"Failed to disconnect: {e}")
 
     # ========================================================================
     # Health & Status
@@ -122,8 +283,14 @@ class UnifiedExchangeClient:
             Dictionary with exchange health status
         """
         try:
-            hl_health = await self.hl_client.health_check()
-            cb_health = await self.cb_client.health_check()
+            hl_health, cb_health = await asyncio.gather(
+                self.hl_client.health_check(),
+                self.cb_client.health_check(),
+                return_exceptions=True
+            )
+            for result in (hl_health, cb_health):
+                if isinstance(result, Exception):
+                    raise result
 
             status = {
                 "hyperliquid": hl_health,
@@ -149,18 +316,20 @@ class UnifiedExchangeClient:
             Dictionary with balance info from each exchange
         """
         try:
-            hl_balance = await self.hl_client.get_balance()
-            cb_balance = await self.cb_client.get_balance()
+            hl_balance, cb_balance = await asyncio.gather(
+                self.hl_client.get_balance(),
+                self.cb_client.get_balance()
+            )
 
             total_balance = hl_balance.total_balance + cb_balance.total_balance
 
             return {
-                "hyperliquid": hl_balance.__dict__,
-                "coinbase": cb_balance.__dict__,
+                "hyperliquid": _pack_hl_balance(hl_balance),
+                "coinbase": _pack_cb_balance(cb_balance),
                 "total": {
                     "total_balance": total_balance,
                     "available": hl_balance.available_balance + cb_balance.available_balance,
-                    "timestamp": datetime.utcnow().isoformat()
+                    "timestamp": _now_iso()
                 }
             }
         except Exception as e:
@@ -175,23 +344,72 @@ class UnifiedExchangeClient:
         """
         Get all positions from both exchanges.
 
+        Results are cached for POSITIONS_CACHE_TTL seconds. If a refresh
+        fails, the last snapshot is returned instead (its timestamp shows
+        its age) as long as it is under POSITIONS_MAX_STALE_AGE seconds old.
+
         Returns:
-            Dictionary with positions from each exchange
+            Dictionary with positions from each exchange. The position lists
+            are copies, so callers may modify them.
         """
+        snapshot = await self._get_positions_snapshot()
+        return {
+            **snapshot,
+            "hyperliquid": list(snapshot["hyperliquid"]),
+            "coinbase": list(snapshot["coinbase"])
+        }
+
+    async def _get_positions_snapshot(self) -> Dict[str, List]:
+        """Shared positions snapshot behind get_all_positions; not to be modified"""
+        age = time.monotonic() - self._positions_cache_ts
+        if (self._positions_cache is not None and not self._positions_invalidated
+                and age < POSITIONS_CACHE_TTL):
+            return self._positions_cache
+
         try:
-            hl_positions = await self.hl_client.get_open_positions()
-            cb_positions = await self.cb_client.get_open_positions()
+            hl_positions, cb_positions = await asyncio.gather(
+                self.hl_client.get_open_positions(),
+                self.cb_client.get_open_positions()
+            )
 
-            return {
-                "hyperliquid": [p.__dict__ for p in hl_positions],
-                "coinbase": [p.__dict__ for p in cb_positions],
+            self._positions_cache = {
+                "hyperliquid": list(map(_pack_hl_position, hl_positions)),
+                "coinbase": list(map(_pack_cb_position, cb_positions)),
                 "total_count": len(hl_positions) + len(cb_positions),
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": _now_iso()
             }
+            self._positions_cache_ts = time.monotonic()
+            self._positions_invalidated = False
+            self._positions_notionals = _compute_notionals(self._positions_cache)
+            return self._positions_cache
         except Exception as e:
+            if self._positions_cache is not None and age < POSITIONS_MAX_STALE_AGE:
+                logger.warning(f"Failed to get positions, using last snapshot: {e}")
+                return self._positions_cache
             logger.error(f"Failed to get positions: {e}")
             raise
 
+    async def _get_notionals(self) -> Tuple[float, float]:
+        """
+        Per-exchange notionals of the current positions snapshot.
+        Computed once per fetch, not on every order.
+
+        Returns:
+            (hyperliquid_notional, coinbase_notional)
+        """
+        await self._get_positions_snapshot()
+        return self._positions_notionals
+
+    def _invalidate_positions(self) -> None:
+        """
+        Record a successful order: force the next get_all_positions to
+        refetch (keeping the fallback copy) and drop the cached order-exchange
+        choice, so the next auto-routed order sees the new allocation.
+        """
+        self._positions_invalidated = True
+        self._cached_allocation = None
+        self._last_order_ts = time.monotonic()
+
     async def get_position(self, asset: str) -> Optional[Dict]:
         """
         Get position across both exchanges.
@@ -202,28 +420,33 @@ class UnifiedExchangeClient:
         Returns:
             Position data or None
         """
-        try:
-            # Try Hyperliquid first
-            hl_pos = await self.hl_client.get_position(asset)
-            if hl_pos:
-                return {
-                    "exchange": "hyperliquid",
-                    "position": hl_pos.__dict__
-                }
+        # Query both venues at once (Coinbase needs the -USD product id).
+        # The first venue to report the position wins and the other request
+        # is cancelled; if both finish together, Hyperliquid is preferred.
+        cb_asset = f"{asset}-USD"
+        lookups = {
+            asyncio.create_task(self.hl_client.get_position(asset)): ("hyperliquid", _pack_hl_position),
+            asyncio.create_task(self.cb_client.get_position(cb_asset)): ("coinbase", _pack_cb_position),
+        }
+        pending = set(lookups)
 
-            # Then try Coinbase (need to convert asset format)
-            cb_asset = f"{asset}-USD"
-            cb_pos = await self.cb_client.get_position(cb_asset)
-            if cb_pos:
-                return {
-                    "exchange": "coinbase",
-                    "position": cb_pos.__dict__
-                }
-
-            return None
-        except Exception as e:
-            logger.error(f"Failed to get position for {asset}: {e}")
-            return None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in (t for t in lookups if t in done):
+                    exchange, pack = lookups[task]
+                    if task.exception():
+                        logger.error(f"Failed to get {exchange} position for {asset}: {task.exception()}")
+                    elif task.result():
+                        return {
+                            "exchange": exchange,
+                            "position": pack(task.result())
+                        }
+        finally:
+            for task in pending:
+                task.cancel()
+
+        return None
 
     # ========================================================================
     # Order Execution
@@ -255,7 +478,9 @@ class UnifiedExchangeClient:
             if not exchange:
                 exchange = await self._select_exchange_for_order(size)
 
-            order_side = OrderSide.BUY if side.upper() == "BUY" else OrderSide.SELL
+            # Anything other than "BUY" (any case) sells, as before
+            side_key = side if side in _HL_SIDE else side.upper()
+            order_side = _HL_SIDE.get(side_key, OrderSide.SELL)
 
             if exchange == ExchangeType.HYPERLIQUID:
                 order = await self.hl_client.place_order(
@@ -266,20 +491,13 @@ class UnifiedExchangeClient:
                     leverage=leverage
                 )
 
-                result = ExecutionResult(
-                    success=True,
-                    exchange=ExchangeType.HYPERLIQUID,
-                    asset=asset,
-                    order_id=order.order_id,
-                    size=size,
-                    price=price,
-                    status=order.status.value,
-                    message=f"Order placed on Hyperliquid",
-                    timestamp=datetime.utcnow().isoformat()
+                result = _ok_result(
+                    ExchangeType.HYPERLIQUID, asset, order, size, price,
+                    "Order placed on Hyperliquid"
                 )
 
             else:  # Coinbase
-                cb_side = CBOrderSide.BUY if side.upper() == "BUY" else CBOrderSide.SELL
+                cb_side = _CB_SIDE.get(side_key, CBOrderSide.SELL)
                 cb_asset = f"{asset}-USD"
 
                 order = await self.cb_client.place_order(
@@ -290,33 +508,46 @@ class UnifiedExchangeClient:
                     price=price
                 )
 
-                result = ExecutionResult(
-                    success=True,
-                    exchange=ExchangeType.COINBASE,
-                    asset=asset,
-                    order_id=order.order_id,
-                    size=size,
-                    price=price,
-                    status=order.status.value,
-                    message=f"Order placed on Coinbase",
-                    timestamp=datetime.utcnow().isoformat()
+                result = _ok_result(
+                    ExchangeType.COINBASE, asset, order, size, price,
+                    "Order placed on Coinbase"
                 )
 
+            self._invalidate_positions()
             logger.info(f"Order executed: {result.exchange.value} {side} {size} {asset}")
             return result
 
         except Exception as e:
             logger.error(f"Failed to place order: {e}")
-            return ExecutionResult(
-                success=False,
-                exchange=exchange or ExchangeType.HYPERLIQUID,
-                asset=asset,
-                order_id="",
-                size=size,
-                price=price,
-                status="FAILED",
-                message=str(e),
-                timestamp=datetime.utcnow().isoformat()
+            return _fail_result(exchange or ExchangeType.HYPERLIQUID, asset, size, price, str(e))
+
+    async def place_orders(self, specs: List[OrderSpec]) -> List[ExecutionResult]:
+        """
+        Place a batch of orders concurrently.
+
+        Orders run in parallel, bounded per exchange by HL_ORDER_CONCURRENCY
+        and CB_ORDER_CONCURRENCY. Failures come back as failed
+        ExecutionResults, as with place_order.
+
+        Args:
+            specs: Orders to place
+
+        Returns:
+            ExecutionResults in the same order as specs
+        """
+        return await asyncio.gather(*(self._place_one(spec) for spec in specs))
+
+    async def _place_one(self, spec: OrderSpec) -> ExecutionResult:
+        """Place one batched order under its exchange's concurrency cap"""
+        exchange = spec.exchange or await self._select_exchange_for_order(spec.size)
+        async with self._order_semaphores[exchange]:
+            return await self.place_order(
+                asset=spec.asset,
+                side=spec.side,
+                size=spec.size,
+                exchange=exchange,
+                price=spec.price,
+                leverage=spec.leverage
             )
 
     async def close_position(self, asset: str) -> ExecutionResult:
@@ -332,35 +563,21 @@ class UnifiedExchangeClient:
         try:
             pos = await self.get_position(asset)
             if not pos:
-                return ExecutionResult(
-                    success=False,
-                    exchange=ExchangeType.HYPERLIQUID,
-                    asset=asset,
-                    order_id="",
-                    size=0,
-                    price=None,
-                    status="NOT_FOUND",
-                    message=f"No position found for {asset}",
-                    timestamp=datetime.utcnow().isoformat()
+                return _fail_result(
+                    ExchangeType.HYPERLIQUID, asset, 0, None, f"No position found for {asset}",
+                    status=_NOT_FOUND_STATUS
                 )
 
-            exchange = ExchangeType[pos["exchange"].upper()]
+            exchange = _EXCHANGE_STR[pos["exchange"]]
 
             if exchange == ExchangeType.HYPERLIQUID:
                 order = await self.hl_client.close_position(asset)
                 if not order:
                     raise Exception("Failed to close position")
 
-                result = ExecutionResult(
-                    success=True,
-                    exchange=ExchangeType.HYPERLIQUID,
-                    asset=asset,
-                    order_id=order.order_id,
-                    size=order.size,
-                    price=order.price,
-                    status=order.status.value,
-                    message="Position closed on Hyperliquid",
-                    timestamp=datetime.utcnow().isoformat()
+                result = _ok_result(
+                    ExchangeType.HYPERLIQUID, asset, order, order.size, order.price,
+                    "Position closed on Hyperliquid"
                 )
 
             else:  # Coinbase
@@ -369,34 +586,18 @@ class UnifiedExchangeClient:
                 if not order:
                     raise Exception("Failed to close position")
 
-                result = ExecutionResult(
-                    success=True,
-                    exchange=ExchangeType.COINBASE,
-                    asset=asset,
-                    order_id=order.order_id,
-                    size=order.size,
-                    price=order.price,
-                    status=order.status.value,
-                    message="Position closed on Coinbase",
-                    timestamp=datetime.utcnow().isoformat()
+                result = _ok_result(
+                    ExchangeType.COINBASE, asset, order, order.size, order.price,
+                    "Position closed on Coinbase"
                 )
 
+            self._invalidate_positions()
             logger.info(f"Position closed: {asset} on {result.exchange.value}")
             return result
 
         except Exception as e:
             logger.error(f"Failed to close position: {e}")
-            return ExecutionResult(
-                success=False,
-                exchange=ExchangeType.HYPERLIQUID,
-                asset=asset,
-                order_id="",
-                size=0,
-                price=None,
-                status="FAILED",
-                message=str(e),
-                timestamp=datetime.utcnow().isoformat()
-            )
+            return _fail_result(ExchangeType.HYPERLIQUID, asset, 0, None, str(e))
 
     async def reduce_position(self,
                              asset: str,
@@ -414,35 +615,21 @@ class UnifiedExchangeClient:
         try:
             pos = await self.get_position(asset)
             if not pos:
-                return ExecutionResult(
-                    success=False,
-                    exchange=ExchangeType.HYPERLIQUID,
-                    asset=asset,
-                    order_id="",
-                    size=0,
-                    price=None,
-                    status="NOT_FOUND",
-                    message=f"No position found for {asset}",
-                    timestamp=datetime.utcnow().isoformat()
+                return _fail_result(
+                    ExchangeType.HYPERLIQUID, asset, 0, None, f"No position found for {asset}",
+                    status=_NOT_FOUND_STATUS
                 )
 
-            exchange = ExchangeType[pos["exchange"].upper()]
+            exchange = _EXCHANGE_STR[pos["exchange"]]
 
             if exchange == ExchangeType.HYPERLIQUID:
                 order = await self.hl_client.reduce_position(asset, reduction_amount)
                 if not order:
                     raise Exception("Failed to reduce position")
 
-                result = ExecutionResult(
-                    success=True,
-                    exchange=ExchangeType.HYPERLIQUID,
-                    asset=asset,
-                    order_id=order.order_id,
-                    size=reduction_amount,
-                    price=order.price,
-                    status=order.status.value,
-                    message=f"Position reduced by {reduction_amount} on Hyperliquid",
-                    timestamp=datetime.utcnow().isoformat()
+                result = _ok_result(
+                    ExchangeType.HYPERLIQUID, asset, order, reduction_amount, order.price,
+                    f"Position reduced by {reduction_amount} on Hyperliquid"
                 )
 
             else:  # Coinbase
@@ -451,34 +638,18 @@ class UnifiedExchangeClient:
                 if not order:
                     raise Exception("Failed to reduce position")
 
-                result = ExecutionResult(
-                    success=True,
-                    exchange=ExchangeType.COINBASE,
-                    asset=asset,
-                    order_id=order.order_id,
-                    size=reduction_amount,
-                    price=order.price,
-                    status=order.status.value,
-                    message=f"Position reduced by {reduction_amount} on Coinbase",
-                    timestamp=datetime.utcnow().isoformat()
+                result = _ok_result(
+                    ExchangeType.COINBASE, asset, order, reduction_amount, order.price,
+                    f"Position reduced by {reduction_amount} on Coinbase"
                 )
 
+            self._invalidate_positions()
             logger.info(f"Position reduced: {asset} ({reduction_amount} units)")
             return result
 
         except Exception as e:
             logger.error(f"Failed to reduce position: {e}")
-            return ExecutionResult(
-                success=False,
-                exchange=ExchangeType.HYPERLIQUID,
-                asset=asset,
-                order_id="",
-                size=0,
-                price=None,
-                status="FAILED",
-                message=str(e),
-                timestamp=datetime.utcnow().isoformat()
-            )
+            return _fail_result(ExchangeType.HYPERLIQUID, asset, 0, None, str(e))
 
     # ========================================================================
     # Market Data
@@ -512,50 +683,107 @@ class UnifiedExchangeClient:
             Dictionary of {asset: price}
         """
         try:
-            prices = await self.hl_client.get_market_prices()
-            return {asset: prices.get(asset) for asset in assets if asset in prices}
+            prices = await self._get_market_prices()
+            return {asset: prices[asset] for asset in assets if asset in prices}
         except Exception as e:
             logger.error(f"Failed to get prices: {e}")
             return {}
 
+    async def _get_market_prices(self) -> Dict[str, float]:
+        """
+        All Hyperliquid market prices, reused for PRICES_CACHE_TTL seconds.
+        Concurrent refreshes share a single request.
+        """
+        if self._prices_cache is not None and time.monotonic() - self._prices_cache_ts < PRICES_CACHE_TTL:
+            return self._prices_cache
+
+        pending = self._prices_request
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._prices_request = future
+        try:
+            prices = await self.hl_client.get_market_prices()
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Waiters re-raise it; don't log it as unretrieved
+            raise
+        except BaseException:
+            # Cancelled: waiters were not, so give them an ordinary error
+            future.set_exception(RuntimeError("Market price request was cancelled"))
+            future.exception()
+            raise
+        finally:
+            self._prices_request = None
+
+        self._prices_cache = prices
+        self._prices_cache_ts = time.monotonic()
+        future.set_result(prices)
+        return prices
+
     # ========================================================================
     # Allocation Management
     # ========================================================================
 
+    async def _allocation_loop(self) -> None:
+        """
+        Refresh the auto-selected order exchange in the background.
+
+        Only polls positions within ALLOCATION_IDLE_TIMEOUT of the last
+        order; while idle, or when a refresh fails, no choice is cached and
+        _select_exchange_for_order computes it inline.
+        """
+        while True:
+            if time.monotonic() - self._last_order_ts < ALLOCATION_IDLE_TIMEOUT:
+                try:
+                    self._cached_allocation = await self._allocation_choice()
+                except Exception as e:
+                    self._cached_allocation = None
+                    logger.warning(f"Failed to refresh order exchange selection: {e}")
+            else:
+                self._cached_allocation = None
+            await asyncio.sleep(ALLOCATION_REFRESH_INTERVAL)
+
     async def _select_exchange_for_order(self, size: float) -> ExchangeType:
         """
         Select exchange for order based on allocation targets.
 
+        Reads the choice kept by _allocation_loop during order activity, so
+        order placement does not wait on a positions fetch. Computes it
+        inline when nothing is cached (idle, right after an order, after a
+        failed refresh, or when not connected).
+
         Args:
             size: Order size
 
         Returns:
             Exchange to use for order
         """
-        try:
-            positions = await self.get_all_positions()
-            hl_notional = sum(
-                abs(p["size"] * p["current_price"])
-                for p in positions["hyperliquid"]
-            )
-            cb_notional = sum(
-                abs(p["size"] * p["current_price"])
-                for p in positions["coinbase"]
-            )
-
-            total_notional = hl_notional + cb_notional
-
-            # If Hyperliquid is below target allocation, use it
-            hl_actual = (hl_notional / total_notional) if total_notional > 0 else 0
-            if hl_actual < self.hl_allocation:
-                return ExchangeType.HYPERLIQUID
-            else:
-                return ExchangeType.COINBASE
+        if self._cached_allocation is not None:
+            return self._cached_allocation
+        return await self._compute_exchange_for_order()
 
+    async def _compute_exchange_for_order(self) -> ExchangeType:
+        """Allocation-based exchange choice, defaulting to Hyperliquid on error"""
+        try:
+            return await self._allocation_choice()
         except Exception as e:
             logger.warning(f"Failed to select exchange, defaulting to Hyperliquid: {e}")
             return ExchangeType.HYPERLIQUID
 
+    async def _allocation_choice(self) -> ExchangeType:
+        """Pick the exchange below its allocation target (raises if positions are unavailable)"""
+        hl_notional, cb_notional = await self._get_notionals()
+        total_notional = hl_notional + cb_notional
+
+        # If Hyperliquid is below target allocation, use it
+        hl_actual = (hl_notional / total_notional) if total_notional > 0 else 0
+        if hl_actual < self.hl_allocation:
+            return ExchangeType.HYPERLIQUID
+        else:
+            return ExchangeType.COINBASE
+
     async def get_allocation_status(self) -> Dict[str, Dict]:
         """
         Get current allocation across exchanges.
@@ -564,17 +792,7 @@ class UnifiedExchangeClient:
             Allocation status with target vs actual
         """
         try:
-            positions = await self.get_all_positions()
-
-            hl_notional = sum(
-                abs(p["size"] * p["current_price"])
-                for p in positions["hyperliquid"]
-            )
-            cb_notional = sum(
-                abs(p["size"] * p["current_price"])
-                for p in positions["coinbase"]
-            )
-
+            hl_notional, cb_notional = await self._get_notionals()
             total_notional = hl_notional + cb_notional
 
             hl_actual = (hl_notional / total_notional) if total_notional > 0 else 0
@@ -594,7 +812,7 @@ class UnifiedExchangeClient:
                     "notional_value": cb_notional
                 },
                 "total_notional": total_notional,
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": _now_iso()
             }
         except Exception as e:
             logger.error(f"Failed to get allocation status: {e}")
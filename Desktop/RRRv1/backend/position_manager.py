@@ -470,7 +470,7 @@ class PositionManager:
             cursor = conn.cursor()
 
             cursor.execute("""
-                SELECT * FROM position_history
+                SELECT * FROM position_history_all
                 WHERE asset = ?
                 ORDER BY timestamp DESC
                 LIMIT ?